@@ -0,0 +1,36 @@
+from typing_extensions import Annotated
+from fastapi import APIRouter, Depends
+
+from backend_api.schemas.cache import CacheStatsList
+from backend_api.schemas.model_providers import ConnectionPoolStatsList
+from backend_api.services.model_providers import (
+    ModelProviderService,
+    get_model_provider_service,
+    hardware_costs_stats,
+    model_costs_stats,
+)
+from backend_api.services.web3 import nfnt_balances_stats
+from backend_api.services.web3_client import Web3Client, get_web3_client
+
+router = APIRouter()
+
+
+@router.get("/pools", response_model=ConnectionPoolStatsList)
+async def get_pool_stats(
+    model_provider_service: Annotated[
+        ModelProviderService, Depends(get_model_provider_service)
+    ],
+    web3_client: Annotated[Web3Client, Depends(get_web3_client)],
+):
+    return ConnectionPoolStatsList(pools=[model_provider_service.stats(), web3_client.stats()])
+
+
+@router.get("/caches", response_model=CacheStatsList)
+async def get_cache_stats():
+    return CacheStatsList(
+        caches=[
+            hardware_costs_stats.stats(),
+            model_costs_stats.stats(),
+            nfnt_balances_stats.stats(),
+        ]
+    )
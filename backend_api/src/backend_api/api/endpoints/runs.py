@@ -1,6 +1,8 @@
 from typing_extensions import Annotated
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends
+from fastapi.responses import StreamingResponse
 
+from backend_api.backend.config import Settings, get_settings
 from backend_api.schemas.auth import VerifyModel
 from backend_api.schemas.model_providers import (
     ModelProviderModelRunAsync,
@@ -15,7 +17,9 @@ from backend_api.schemas.model_providers import (
 )
 from backend_api.services.auth import get_current_user
 from backend_api.services.balance import BalanceService, get_balance_service
+from backend_api.services.run_stream import RunWatcherHub, get_run_watcher_hub
 from backend_api.services.runs import RunService, get_run_service
+from backend_api.services.web3 import Web3Service, get_web3_service
 from backend_api.utils import create_siwe_message, verify_siwe_message
 
 router = APIRouter(dependencies=[Depends(get_current_user)])
@@ -24,8 +28,12 @@ router = APIRouter(dependencies=[Depends(get_current_user)])
 @router.get("/{model}/message", response_model=SiweRunModel)
 async def create_message(
     model: str,
+    background_tasks: BackgroundTasks,
     user: UserSchema = Depends(get_current_user),
+    web3_service: Web3Service = Depends(get_web3_service),
 ):
+    # the run request follows once the message is signed, have the token gate ready by then
+    background_tasks.add_task(web3_service.prefetch_balances, [user.wallet_address])
     msg = create_siwe_message(
         user.wallet_address,
         statement=f"Run model {model}",
@@ -75,3 +83,22 @@ async def get_run_result(
     run_service: RunService = Depends(get_run_service),
 ):
     return await run_service.get_run_result(run_id)
+
+
+@router.get("/{run_id}/stream", response_class=StreamingResponse)
+async def stream_run(
+    run_id: str,
+    settings: Annotated[Settings, Depends(get_settings)],
+    run_watchers: Annotated[RunWatcherHub, Depends(get_run_watcher_hub)],
+):
+    """Server-sent events with the run status transitions, then its result."""
+
+    async def events():
+        async for event in run_watchers.subscribe(run_id, settings):
+            yield ": keep-alive\n\n" if event is None else event.to_sse()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
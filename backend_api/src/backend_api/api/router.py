@@ -1,6 +1,8 @@
 from fastapi import APIRouter
 
-from backend_api.api.endpoints import auth, models, users, balance, transactions, runs, media
+from backend_api.api.endpoints import (
+    auth, models, users, balance, transactions, runs, media, internal
+)
 
 api_router = APIRouter()
 api_router.include_router(
@@ -12,4 +14,7 @@ api_router.include_router(transactions.router, prefix="/user", tags=["User Endpo
 api_router.include_router(models.router, tags=["Models Endpoints"])
 api_router.include_router(runs.router, prefix="/runs", tags=["Run Endpoints"])
 
-api_router.include_router(media.router, prefix="/media", tags=["Media Endpoints"])
\ No newline at end of file
+api_router.include_router(media.router, prefix="/media", tags=["Media Endpoints"])
+api_router.include_router(
+    internal.router, prefix="/internal", tags=["Internal Endpoints"], include_in_schema=False
+)
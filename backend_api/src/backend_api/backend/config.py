@@ -14,6 +14,23 @@ def _get_contract_abi():
         return json.load(f)
 
 
+@lru_cache
+def _get_nfnt_abi():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data/nfnt_abi.json")
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return json.load(f)
+
+
+@lru_cache
+def _get_multicall3_abi():
+    with open(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "data/multicall3_abi.json")
+    ) as f:
+        return json.load(f)
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_prefix="BACKEND_API_", case_sensitive=False)
 
@@ -32,6 +49,16 @@ class Settings(BaseSettings):
         default=2, validation_alias="BACKEND_API_PROVIDER_API_RETRY_FACTOR"
     )
 
+    provider_api_pool_limit: int = Field(
+        default=100, validation_alias="BACKEND_API_PROVIDER_API_POOL_LIMIT"
+    )
+    provider_api_pool_limit_per_host: int = Field(
+        default=50, validation_alias="BACKEND_API_PROVIDER_API_POOL_LIMIT_PER_HOST"
+    )
+    provider_api_keepalive_timeout: float = Field(
+        default=30.0, validation_alias="BACKEND_API_PROVIDER_API_KEEPALIVE_TIMEOUT"
+    )
+
     provider: str = Field(validation_alias="BACKEND_API_PROVIDER_NAME")
 
     free_trial_mode: bool = Field(default=True, validation_alias="BACKEND_API_FREE_TRIAL_MODE")
@@ -46,10 +73,67 @@ class Settings(BaseSettings):
     contract_abi: list = Field(default_factory=_get_contract_abi)
 
     infura_base_url: str = Field(validation_alias="BACKEND_API_INFURA_BASE_URL")
+    web3_pool_limit: int = Field(default=20, validation_alias="BACKEND_API_WEB3_POOL_LIMIT")
+    web3_keepalive_timeout: float = Field(
+        default=30.0, validation_alias="BACKEND_API_WEB3_KEEPALIVE_TIMEOUT"
+    )
+    web3_request_timeout: float = Field(
+        default=10.0, validation_alias="BACKEND_API_WEB3_REQUEST_TIMEOUT"
+    )
+    web3_breaker_failure_threshold: int = Field(
+        default=5, validation_alias="BACKEND_API_WEB3_BREAKER_FAILURE_THRESHOLD"
+    )
+    web3_breaker_reset_timeout: float = Field(
+        default=30.0, validation_alias="BACKEND_API_WEB3_BREAKER_RESET_TIMEOUT"
+    )
+    web3_batch_window: float = Field(
+        default=0.002, validation_alias="BACKEND_API_WEB3_BATCH_WINDOW"
+    )
+    web3_logs_block_range: int = Field(
+        default=2000, validation_alias="BACKEND_API_WEB3_LOGS_BLOCK_RANGE"
+    )
+    web3_confirmations: int = Field(default=12, validation_alias="BACKEND_API_WEB3_CONFIRMATIONS")
+    web3_reorg_window: int = Field(default=12, validation_alias="BACKEND_API_WEB3_REORG_WINDOW")
+    web3_start_block: int | None = Field(
+        default=None, validation_alias="BACKEND_API_WEB3_START_BLOCK"
+    )
+    web3_backfill_max_blocks: int = Field(
+        default=100000, validation_alias="BACKEND_API_WEB3_BACKFILL_MAX_BLOCKS"
+    )
+    web3_backfill_concurrency: int = Field(
+        default=4, validation_alias="BACKEND_API_WEB3_BACKFILL_CONCURRENCY"
+    )
+    web3_events_chunk_size: int = Field(
+        default=1000, validation_alias="BACKEND_API_WEB3_EVENTS_CHUNK_SIZE"
+    )
+    web3_batch_max_size: int = Field(default=50, validation_alias="BACKEND_API_WEB3_BATCH_MAX_SIZE")
     coingecko_api_key: str = Field(validation_alias="BACKEND_API_COINGECKO_API_KEY")
 
     etherscan_api_key: str = Field(validation_alias="BACKEND_API_ETHERSCAN_API_KEY")
     nfnt_contract_address: str = Field(validation_alias="BACKEND_API_NFNT_CONTRACT_ADDRESS")
+    nfnt_contract_abi: list = Field(default_factory=_get_nfnt_abi)
+    nfnt_balance_cache_ttl: int = Field(
+        default=30, validation_alias="BACKEND_API_NFNT_BALANCE_CACHE_TTL"
+    )
+
+    multicall3_address: str = Field(
+        default="0xcA11bde05977b3631167028862bE2a173976CA11",
+        validation_alias="BACKEND_API_MULTICALL3_ADDRESS",
+    )
+    multicall3_abi: list = Field(default_factory=_get_multicall3_abi)
+    multicall3_max_calldata_bytes: int = Field(
+        default=32768, validation_alias="BACKEND_API_MULTICALL3_MAX_CALLDATA_BYTES"
+    )
+
+    run_optimistic_dispatch: bool = Field(
+        default=False, validation_alias="BACKEND_API_RUN_OPTIMISTIC_DISPATCH"
+    )
+    run_stream_poll_interval: float = Field(
+        default=1.0, validation_alias="BACKEND_API_RUN_STREAM_POLL_INTERVAL"
+    )
+    run_stream_heartbeat: float = Field(
+        default=15.0, validation_alias="BACKEND_API_RUN_STREAM_HEARTBEAT"
+    )
 
     time_to_pay_minutes: int = Field(default=15, validation_alias="BACKEND_API_TIME_TO_PAY_MINUTES")
 
@@ -1,4 +1,7 @@
 import aiocache
+from aiocache.plugins import BasePlugin
+
+from backend_api.schemas.cache import CacheStats
 
 
 def init_cache():
@@ -8,3 +11,45 @@ def init_cache():
             'serializer': {'class': 'aiocache.serializers.JsonSerializer'},
         },
     })
+
+
+class BoundedStatsPlugin(BasePlugin):
+    """Counts hits and loads of a `SimpleMemoryCache` and bounds its size.
+
+    Once more than `max_size` values are stored the oldest ones are evicted.
+    Stampede lock keys are added with `add` and are neither counted nor evicted.
+    """
+
+    def __init__(self, name: str, max_size: int | None = None):
+        self.name = name
+        self.max_size = max_size
+        self._client = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def post_get(self, client, key, ret=None, **kwargs):
+        if ret is not None:
+            self.hits += 1
+
+    async def post_set(self, client, key, value, ret=None, **kwargs):
+        self._client = client
+        self.misses += 1
+        keys = self._keys()
+        while self.max_size is not None and len(keys) > self.max_size:
+            await client._delete(keys.pop(0))
+            self.evictions += 1
+
+    def _keys(self) -> list[str]:
+        if self._client is None:
+            return []
+        return [key for key in self._client._cache if not key.endswith("-lock")]
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            name=self.name,
+            size=len(self._keys()),
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
@@ -7,4 +7,10 @@ class Web3EventNotFoundInABIException(Web3Exception):
 
 
 class Web3UnableToDetermineBlock(Web3Exception):
-    pass
\ No newline at end of file
+    pass
+
+class Web3ContractNotRegistered(Web3Exception):
+    pass
+
+class Web3ProviderUnavailable(Web3Exception):
+    pass
@@ -12,6 +12,11 @@ from backend_api import tasks  # noqa: F401
 from backend_api.admin import site
 from backend_api.cache import init_cache
 from backend_api.backend.storage import init_storage
+from backend_api.backend.config import get_settings
+from backend_api.services.contracts import load_contract_abis
+from backend_api.services.model_providers import get_model_provider_service
+from backend_api.services.run_stream import run_watchers
+from backend_api.services.web3_client import get_web3_client
 
 configure_logging()
 logger = get_logger(__name__)
@@ -21,9 +26,15 @@ logger = get_logger(__name__)
 async def lifespan(app: FastAPI):
     init_cache()
     init_storage()
+    get_model_provider_service().open()
+    get_web3_client().open()
+    await load_contract_abis(get_settings())
     scheduler.start()
     yield
     scheduler.shutdown()
+    await run_watchers.close()
+    await get_model_provider_service().close()
+    await get_web3_client().close()
 
 
 app = FastAPI(title="Backend API", version="0.0.1", lifespan=lifespan)
@@ -3,7 +3,7 @@ from .usage import Usage
 from .users import User
 from .categories import Category
 from .models import Model
-from .web3 import Web3Event
+from .web3 import Web3BlockCursor, Web3Event
 
 
 __all__ = (
@@ -15,4 +15,5 @@ __all__ = (
     'Category',
     'Model',
     'Web3Event',
+    'Web3BlockCursor',
 )
\ No newline at end of file
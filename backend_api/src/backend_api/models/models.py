@@ -16,7 +16,7 @@ class Model(SQLModel, table=True):
     id: int = Field(default=None, primary_key=True)
     category_id: int = Field(default=None, foreign_key="categories.id")
     name: str = Field(nullable=False)
-    slug: str = Field(nullable=False)
+    slug: str = Field(nullable=False, unique=True, index=True)
     default_example: dict = Field(default_factory=dict, sa_column=Column(JSON))
     latest_version: dict = Field(default_factory=dict, sa_column=Column(JSON))
     version: str = Field(nullable=True)
@@ -6,7 +6,7 @@ class Web3Event(SQLModel, table=True):
     __tablename__ = "web3_events"  # type: ignore
 
     event_id: str = Field(default=None, primary_key=True)
-    block_number: int = Field(nullable=False)
+    block_number: int = Field(nullable=False, index=True)
     transaction_hash: str = Field(nullable=False)
     log_index: int = Field(nullable=True)
     address: str = Field(nullable=False)
@@ -19,3 +19,14 @@ class Web3Event(SQLModel, table=True):
 
     class Config:
         arbitrary_types_allowed = True
+
+
+class Web3BlockCursor(SQLModel, table=True):
+    """Last confirmed block whose events of the contract at `address` are all stored."""
+
+    __tablename__ = "web3_block_cursors"  # type: ignore
+
+    address: str = Field(primary_key=True)
+    block_number: int = Field(nullable=False)
+
+    updated_at: datetime = Field(default_factory=datetime.now, nullable=False)
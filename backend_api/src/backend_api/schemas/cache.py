@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    name: str
+    size: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class CacheStatsList(BaseModel):
+    caches: list[CacheStats]
@@ -65,10 +65,10 @@ class ModelProviderModelRunAsyncResult(ModelProviderModelRunAsync):
 
 
 class ModelProviderHardwareCostInfo(BaseModel):
-    name: str
-    sku: str
-    price_per_second: float
-    price_per_hour: float
+    name: str | None
+    sku: str | None
+    price_per_second: float | None
+    price_per_hour: float | None
     gpu_count: int
     cpu_count: int
     gpu_ram_gb: int
@@ -80,10 +80,29 @@ class ModelProviderHardwareCosts(BaseModel):
 
 
 class ModelProviderModelCostInfo(BaseModel):
-    name: str
-    sku: str
-    prediction_time: float
+    name: str | None
+    sku: str | None
+    prediction_time: float | None
 
 
 class ModelProviderModelCosts(BaseModel):
-    info: ModelProviderModelCostInfo
+    info: ModelProviderModelCostInfo | None
+
+
+class ModelProviderModelCostsWarm(BaseModel):
+    scheduled: int
+
+
+class ConnectionPoolStats(BaseModel):
+    name: str
+    max_connections: int
+    max_connections_per_host: int
+    idle: int
+    active: int
+    waiting: int
+    queued: int
+    queued_time: float
+
+
+class ConnectionPoolStatsList(BaseModel):
+    pools: list[ConnectionPoolStats]
@@ -63,3 +63,15 @@ class UpdateModel(BaseModel):
 
 class ModelList(BaseModel):
     models: list[Model]
+
+
+class ModelSyncReport(BaseModel):
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deactivated: int = 0
+    new_versions: int = 0
+    failed_categories: list[str] = Field(default_factory=list)
+
+    fetch_time: float = 0
+    write_time: float = 0
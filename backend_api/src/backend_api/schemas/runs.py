@@ -1,3 +1,5 @@
+import json
+
 from pydantic import BaseModel, computed_field
 from siwe import SiweMessage
 
@@ -9,3 +11,11 @@ class SiweRunModel(BaseModel):
     @property
     def prepared_message(self) -> str:
         return self.message.prepare_message()
+
+
+class RunStreamEvent(BaseModel):
+    event: str
+    data: dict
+
+    def to_sse(self) -> str:
+        return f"event: {self.event}\ndata: {json.dumps(self.data)}\n\n"
@@ -1,10 +1,13 @@
 from typing import (
     Generic,
     List,
+    NamedTuple,
     Sequence,
     TypeVar,
 )
 
+from sqlalchemy import JSON, Column, cast, literal_column, or_
+from sqlalchemy.dialects.postgresql import JSONB, insert
 from sqlalchemy.sql.expression import Executable
 
 from backend_api.backend.session import AsyncSession
@@ -19,6 +22,20 @@ class SessionMixin:
 
 T = TypeVar("T")
 
+# asyncpg refuses statements with more bind parameters than this
+MAX_BIND_PARAMS = 32767
+
+
+class UpsertResult(NamedTuple):
+    inserted: int
+    updated: int
+    unchanged: int
+
+
+def _comparable(column: Column, value):
+    # `json` has no equality operator in PostgreSQL, compare as `jsonb`
+    return cast(value, JSONB) if isinstance(column.type, JSON) else value
+
 
 class BaseService(SessionMixin, Generic[T]):
     """Base class for application services."""
@@ -44,3 +61,73 @@ class BaseDataManager(SessionMixin, Generic[T]):
 
     async def get_all(self, select_stmt: Executable) -> List[T]:
         return list((await self.session.scalars(select_stmt)).all())
+
+    async def bulk_upsert(
+        self,
+        models: Sequence[T],
+        conflict_cols: Sequence[str],
+        update_cols: Sequence[str],
+        touch_cols: Sequence[str] = (),
+        chunk_size: int = 1000,
+    ) -> UpsertResult:
+        """
+        Insert `models`, updating the rows that already exist by `conflict_cols`.
+
+        Runs one `INSERT ... ON CONFLICT` per chunk on the table itself, bypassing
+        the ORM unit of work and identity map, and commits once. An existing row is
+        only rewritten when one of `update_cols` differs; `touch_cols` (e.g.
+        `updated_at`) are written along but not compared. Without `update_cols`
+        existing rows are left alone. `conflict_cols` must be covered by a unique
+        index, and of several models with the same key the last one wins.
+        """
+        if not models:
+            return UpsertResult(0, 0, 0)
+
+        by_key = {tuple(getattr(model, name) for name in conflict_cols): model for model in models}
+        unique_models = list(by_key.values())
+        table = type(unique_models[0]).__table__  # type: ignore[attr-defined]
+        # leave unset primary keys (e.g. autoincrement ids) to the database
+        columns = [
+            column
+            for column in table.columns
+            if not column.primary_key
+            or column.name in conflict_cols
+            or any(getattr(model, column.name) is not None for model in unique_models)
+        ]
+        stmt = insert(table)
+        if update_cols:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(conflict_cols),
+                set_={name: stmt.excluded[name] for name in [*update_cols, *touch_cols]},
+                where=or_(
+                    *(
+                        _comparable(table.c[name], table.c[name]).is_distinct_from(
+                            _comparable(table.c[name], stmt.excluded[name])
+                        )
+                        for name in update_cols
+                    )
+                ),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_cols))
+        # `xmax` is 0 for rows this statement inserted and set for the ones it updated
+        stmt = stmt.returning(literal_column("xmax = 0")).execution_options(
+            insertmanyvalues_page_size=max(1, MAX_BIND_PARAMS // len(columns))
+        )
+
+        # one cached statement, sent as batches of multi-row VALUES ("insertmanyvalues")
+        inserted = updated = 0
+        for start in range(0, len(unique_models), chunk_size):
+            result = await self.session.execute(
+                stmt,
+                [
+                    {column.name: getattr(model, column.name) for column in columns}
+                    for model in unique_models[start : start + chunk_size]
+                ],
+            )
+            created = result.scalars().all()
+            inserted += sum(created)
+            updated += len(created) - sum(created)
+
+        await self.session.commit()
+        return UpsertResult(inserted, updated, len(unique_models) - inserted - updated)
@@ -0,0 +1,161 @@
+import json
+from functools import lru_cache
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from eth_abi.codec import ABICodec
+from eth_abi.grammar import parse as parse_abi_type
+from eth_typing import ChecksumAddress
+from eth_utils import event_abi_to_log_topic
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3._utils.abi import abi_to_signature
+from web3._utils.events import get_event_data
+from web3.contract import AsyncContract
+from web3.exceptions import MismatchedABI
+from web3.types import LogReceipt
+
+from backend_api.backend.config import Settings
+from backend_api.backend.logging import get_logger
+from backend_api.exceptions.web3 import Web3ContractNotRegistered
+from backend_api.services.etherscan import EtherscanService
+
+logger = get_logger(__name__)
+
+
+@lru_cache(maxsize=4096)
+def to_checksum_address(address: str) -> ChecksumAddress:
+    return AsyncWeb3.to_checksum_address(address)
+
+
+class ContractEvent:
+    """An ABI event with its signature, topic0 and a decoder prepared once.
+
+    Logs whose inputs are all plain types are decoded directly with the
+    prepared types, others go through web3's generic `get_event_data`.
+    """
+
+    def __init__(self, abi: dict) -> None:
+        self.abi = abi
+        self.name: str = abi["name"]
+        self.signature = abi_to_signature(abi)
+        self.topic0 = HexBytes(event_abi_to_log_topic(abi)).hex()
+
+        inputs = abi["inputs"]
+        # dynamic indexed inputs are stored as the keccak of their value
+        self.topic_names = [item["name"] for item in inputs if item["indexed"]]
+        self.topic_types = [
+            "bytes32" if parse_abi_type(item["type"]).is_dynamic else item["type"]
+            for item in inputs
+            if item["indexed"]
+        ]
+        self.data_names = [item["name"] for item in inputs if not item["indexed"]]
+        self.data_types = [item["type"] for item in inputs if not item["indexed"]]
+        self._address_names = [item["name"] for item in inputs if item["type"] == "address"]
+        self._plain = all(
+            "[" not in item["type"] and not item["type"].startswith("tuple") for item in inputs
+        )
+
+    def decode_args(self, codec: ABICodec, log: LogReceipt) -> dict[str, Any]:
+        if not self._plain:
+            return dict(get_event_data(codec, self.abi, log)["args"])
+
+        topics = log["topics"][1:]
+        if len(topics) != len(self.topic_types):
+            raise MismatchedABI(f"Expected {len(self.topic_types)} log topics for {self.name}")
+        args = {
+            name: codec.decode([type_], topic)[0]
+            for name, type_, topic in zip(self.topic_names, self.topic_types, topics)
+        }
+        args.update(zip(self.data_names, codec.decode(self.data_types, HexBytes(log["data"]))))
+        for name in self._address_names:
+            args[name] = to_checksum_address(args[name])
+        return args
+
+
+class EventIndex:
+    """The events of a contract ABI by name and by topic0, computed once per ABI."""
+
+    def __init__(self, abi: list) -> None:
+        self.by_name: dict[str, ContractEvent] = {}
+        self.by_topic: dict[bytes, ContractEvent] = {}
+        for item in abi:
+            if item["type"] != "event" or item.get("anonymous"):
+                continue
+            event = ContractEvent(item)
+            self.by_name[event.name] = event
+            self.by_topic[HexBytes(event.topic0)] = event
+
+    @property
+    def topics(self) -> list[str]:
+        return [event.topic0 for event in self.by_name.values()]
+
+    def for_log(self, log: LogReceipt) -> ContractEvent | None:
+        topics = log["topics"]
+        return self.by_topic.get(bytes(topics[0])) if topics else None
+
+
+class ContractRegistry:
+    """Process-wide contract ABIs and the contract instances built from them.
+
+    Instances are kept per web3 client, so they are dropped together with it.
+    """
+
+    def __init__(self) -> None:
+        self._abis: dict[ChecksumAddress, list] = {}
+        self._events: dict[ChecksumAddress, EventIndex] = {}
+        self._contracts: WeakKeyDictionary[AsyncWeb3, dict[ChecksumAddress, AsyncContract]] = (
+            WeakKeyDictionary()
+        )
+
+    def register(self, address: str, abi: list) -> None:
+        checksum_address = to_checksum_address(address)
+        self._abis[checksum_address] = abi
+        self._events[checksum_address] = EventIndex(abi)
+        for contracts in self._contracts.values():
+            contracts.pop(checksum_address, None)
+
+    def events(self, address: str) -> EventIndex:
+        checksum_address = to_checksum_address(address)
+        try:
+            return self._events[checksum_address]
+        except KeyError:
+            raise Web3ContractNotRegistered(f"No ABI registered for {checksum_address}")
+
+    def get(self, w3: AsyncWeb3, address: str) -> AsyncContract:
+        checksum_address = to_checksum_address(address)
+        contracts = self._contracts.setdefault(w3, {})
+        contract = contracts.get(checksum_address)
+        if contract is None:
+            try:
+                abi = self._abis[checksum_address]
+            except KeyError:
+                raise Web3ContractNotRegistered(f"No ABI registered for {checksum_address}")
+            contract = contracts[checksum_address] = w3.eth.contract(
+                address=checksum_address, abi=abi
+            )
+        return contract
+
+
+contracts = ContractRegistry()
+
+
+async def load_contract_abis(settings: Settings) -> None:
+    """Register the bundled contract ABIs, asking Etherscan only for a missing NFNT ABI."""
+    contracts.register(settings.contract_address, settings.contract_abi)
+    contracts.register(settings.multicall3_address, settings.multicall3_abi)
+
+    abi = settings.nfnt_contract_abi
+    if not abi:
+        try:
+            async with EtherscanService(settings=settings) as etherscan_service:
+                abi = await etherscan_service.get_contract_abi(
+                    contract_address=settings.nfnt_contract_address
+                )
+        except Exception as error:
+            logger.error(f"Getting NFNT contract ABI from Etherscan, {error=}")
+            return
+        if isinstance(abi, str):
+            abi = json.loads(abi)
+    contracts.register(settings.nfnt_contract_address, abi)
+
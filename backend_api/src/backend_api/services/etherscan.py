@@ -26,7 +26,7 @@ class EtherscanService:
         await self.client.__aexit__(*args, **kwargs)
         await self.session.close()
 
-    @cached(ttl=60 * 5)
+    @cached(ttl=60 * 5, noself=True)
     async def get_contract_abi(self, contract_address: str) -> dict:
         api_key = self._settings.etherscan_api_key
         url = (
@@ -1,4 +1,5 @@
 from functools import lru_cache
+import asyncio
 import logging
 import time
 from http import HTTPStatus
@@ -6,14 +7,16 @@ from urllib.parse import urlencode, urljoin
 
 import aiohttp
 import aiohttp_retry
-from fastapi import Depends
-from typing_extensions import Annotated
+from aiocache import cached_stampede
 
 from backend_api.backend.config import Settings, get_settings
+from backend_api.cache import BoundedStatsPlugin
 from backend_api.schemas.model_providers import (
+    ConnectionPoolStats,
     ModelProviderCategoryList,
     ModelProviderHardwareCosts,
     ModelProviderModelCosts,
+    ModelProviderModelCostsWarm,
     ModelProviderModelList,
     ModelProviderModelRunAsync,
     ModelProviderModelRunAsyncResult,
@@ -28,6 +31,10 @@ class ModelProviderException(Exception):
     pass
 
 
+hardware_costs_stats = BoundedStatsPlugin("hardware_costs", max_size=16)
+model_costs_stats = BoundedStatsPlugin("model_costs", max_size=1024)
+
+
 async def on_request_start(session, trace_config_ctx, params):
     trace_config_ctx.start = time.time()
 
@@ -38,33 +45,93 @@ async def on_request_end(session, trace_config_ctx, params):
 
 
 class ModelProviderService:
+    """Client for the provider API gateway.
+
+    A single instance is opened in the app lifespan and shared by request
+    handlers and scheduled tasks, so every call reuses the same keep-alive
+    connection pool.
+    """
+
+    NAME = "provider_api"
+
     def __init__(
         self,
         settings: Settings,
     ) -> None:
         self.api_url = settings.provider_api_url
         self.settings = settings
-        self.init_client()
+        self._connector: aiohttp.TCPConnector | None = None
+        self._client: aiohttp_retry.RetryClient | None = None
+
+        self.queued = 0
+        self.queued_time = 0.0
 
-    def init_client(self):
+    def open(self):
         trace_config = aiohttp.TraceConfig()
         trace_config.on_request_start.append(on_request_start)
         trace_config.on_request_end.append(on_request_end)
-        session = aiohttp.ClientSession(trace_configs=[trace_config])
+        trace_config.on_connection_queued_start.append(self._on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_connection_queued_end)
+        self._connector = aiohttp.TCPConnector(
+            limit=self.settings.provider_api_pool_limit,
+            limit_per_host=self.settings.provider_api_pool_limit_per_host,
+            keepalive_timeout=self.settings.provider_api_keepalive_timeout,
+        )
+        session = aiohttp.ClientSession(connector=self._connector, trace_configs=[trace_config])
         retry_options = aiohttp_retry.ExponentialRetry(
             attempts=self.settings.provider_api_retry_attempts,
             factor=self.settings.provider_api_factor,
         )
-        self.client = aiohttp_retry.RetryClient(
-            client_session=session, retry=retry_options
+        self._client = aiohttp_retry.RetryClient(
+            client_session=session, retry_options=retry_options
         )
+        logger.info(f"Provider API client opened. limit={self._connector.limit}")
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+        self._client = None
+        self._connector = None
+        logger.info("Provider API client closed")
 
     async def __aenter__(self):
-        await self.client.__aenter__()
+        self.open()
         return self
 
     async def __aexit__(self, *args, **kwargs):
-        await self.client.__aexit__(*args, **kwargs)
+        await self.close()
+
+    @property
+    def client(self) -> aiohttp_retry.RetryClient:
+        if self._client is None:
+            raise ModelProviderException("Provider API client is not open")
+        return self._client
+
+    async def _on_connection_queued_start(self, session, trace_config_ctx, params):
+        trace_config_ctx.queued_start = time.time()
+
+    async def _on_connection_queued_end(self, session, trace_config_ctx, params):
+        waited = time.time() - trace_config_ctx.queued_start
+        self.queued += 1
+        self.queued_time += waited
+        logger.warning(f"Provider API connection pool saturated. {waited=}")
+
+    def stats(self) -> ConnectionPoolStats:
+        idle = active = waiting = 0
+        if self._connector is not None:
+            idle = sum(len(conns) for conns in self._connector._conns.values())
+            active = len(self._connector._acquired)
+            waiting = sum(len(waiters) for waiters in self._connector._waiters.values())
+        return ConnectionPoolStats(
+            name=self.NAME,
+            max_connections=self.settings.provider_api_pool_limit,
+            max_connections_per_host=self.settings.provider_api_pool_limit_per_host,
+            idle=idle,
+            active=active,
+            waiting=waiting,
+            queued=self.queued,
+            queued_time=self.queued_time,
+        )
 
     def _build_url(self, path: str, **params) -> str:
         if params:
@@ -80,9 +147,29 @@ class ModelProviderService:
             data = await response.json()
         return ModelProviderCategoryList(**data)
 
-    async def list_models(self, provider: str, category: str) -> ModelProviderModelList:
+    async def list_models(
+        self,
+        provider: str,
+        category: str,
+        timeout: float | None = None,
+        attempts: int | None = None,
+    ) -> ModelProviderModelList:
+        """List the models of a category.
+
+        `timeout` bounds every attempt. With `attempts` the call is retried on
+        server errors as well as on connection errors and timeouts.
+        """
         url = self._build_url(f"/providers/{provider}/categories/{category}/models")
-        async with self.client.get(url) as response:
+        options = {}
+        if timeout is not None:
+            options["timeout"] = aiohttp.ClientTimeout(total=timeout)
+        if attempts is not None:
+            options["retry_options"] = aiohttp_retry.ExponentialRetry(
+                attempts=attempts,
+                factor=self.settings.provider_api_factor,
+                exceptions={aiohttp.ClientError, asyncio.TimeoutError},
+            )
+        async with self.client.get(url, **options) as response:
             if response.status != HTTPStatus.OK:
                 logger.error(f"Error while listing models: {response=}")
                 raise ModelProviderException("Error while listing models")
@@ -140,6 +227,23 @@ class ModelProviderService:
 
         return ModelProviderModelRunAsyncResult(**data)
 
+    async def cancel_run(self, job_id: str) -> ModelProviderModelRunAsyncStatus:
+        url = self._build_url(f"/runs/{job_id}/cancel")
+        async with self.client.post(url) as response:
+            if response.status != HTTPStatus.OK:
+                logger.error(f"Error while cancelling run: {response=}")
+                raise ModelProviderException("Error while cancelling run")
+            data = await response.json()
+
+        return ModelProviderModelRunAsyncStatus(**data)
+
+    @cached_stampede(
+        ttl=60 * 60,
+        # must outlast a gateway call, concurrent misses then wait for the first load
+        lease=30,
+        noself=True,
+        plugins=[model_costs_stats],
+    )
     async def get_model_costs(
         self, provider: str, model: str
     ) -> ModelProviderModelCosts:
@@ -151,7 +255,29 @@ class ModelProviderService:
             data = await response.json()
         return ModelProviderModelCosts(**data)
 
-    @lru_cache
+    async def warm_model_costs(self, provider: str, models: list[str]) -> ModelProviderModelCostsWarm:
+        url = self._build_url(f"/providers/{provider}/models/info/warm")
+        async with self.client.post(url, json={"models": models}) as response:
+            if response.status != HTTPStatus.OK:
+                logger.error(f"Error while warming model costs: {response=}")
+                raise ModelProviderException("Error while warming model costs")
+            data = await response.json()
+        return ModelProviderModelCostsWarm(**data)
+
+    async def invalidate_model_ref(self, provider: str, model: str) -> None:
+        url = self._build_url(f"/providers/{provider}/models/{model}/ref")
+        async with self.client.delete(url) as response:
+            if response.status != HTTPStatus.NO_CONTENT:
+                logger.error(f"Error while invalidating model ref: {response=}")
+                raise ModelProviderException("Error while invalidating model ref")
+
+    @cached_stampede(
+        ttl=60 * 60,
+        # must outlast a gateway call, concurrent misses then wait for the first load
+        lease=30,
+        noself=True,
+        plugins=[hardware_costs_stats],
+    )
     async def get_hardware_costs(self, provider: str) -> ModelProviderHardwareCosts:
         url = self._build_url(f"/providers/{provider}/hardware/costs")
         async with self.client.get(url) as response:
@@ -162,8 +288,6 @@ class ModelProviderService:
         return ModelProviderHardwareCosts(**data)
 
 
-async def get_model_provider_service(
-    settings: Annotated[Settings, Depends(get_settings)],
-):
-    async with ModelProviderService(settings) as service:
-        yield service
+@lru_cache
+def get_model_provider_service() -> ModelProviderService:
+    return ModelProviderService(get_settings())
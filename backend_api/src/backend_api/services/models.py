@@ -11,7 +11,7 @@ from backend_api.schemas.models import (
     CreateModel as CreateModelSchema,
     UpdateModel as UpdateModelSchema,
 )
-from backend_api.services.base import BaseDataManager, BaseService
+from backend_api.services.base import BaseDataManager, BaseService, UpsertResult
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +27,9 @@ class ModelService(BaseService[ModelSchema]):
         models = await ModelManager(self.session).get_models_by_category(category_id)
         return ModelListSchema(models=models)
 
+    async def get_active_model_slugs(self) -> list[str]:
+        return await ModelManager(self.session).get_active_model_slugs()
+
     async def create_model(self, model: CreateModelSchema) -> ModelSchema:
         return await ModelManager(self.session).add_model(model)
 
@@ -36,6 +39,15 @@ class ModelService(BaseService[ModelSchema]):
     async def update_models_status(self, models_ids: list[int], status: bool) -> list[ModelSchema]:
         return await ModelManager(self.session).update_is_active(models_ids, status)
 
+    async def get_model_versions(self) -> dict[str, str | None]:
+        return await ModelManager(self.session).get_model_versions()
+
+    async def upsert_models(self, models: list[CreateModelSchema]) -> UpsertResult:
+        return await ModelManager(self.session).upsert_models(models)
+
+    async def deactivate_missing_models(self, category_ids: list[int], slugs: set[str]) -> int:
+        return await ModelManager(self.session).deactivate_missing(category_ids, slugs)
+
 
 class ModelManager(BaseDataManager[ModelSchema]):
     async def get_model(self, model_id: int) -> ModelSchema | None:
@@ -66,6 +78,12 @@ class ModelManager(BaseDataManager[ModelSchema]):
         models = await self.get_all(stmt)
         return [ModelSchema(**model.model_dump()) for model in models]
 
+    async def get_active_model_slugs(self) -> list[str]:
+        from backend_api.models.models import Model
+        stmt = select(Model.slug).where(Model.is_active)
+
+        return await self.get_all(stmt)
+
     async def add_model(self, create_model: CreateModelSchema) -> ModelSchema:
         from backend_api.models.models import Model
         model = await self.add_one(Model(**create_model.model_dump()))
@@ -97,6 +115,50 @@ class ModelManager(BaseDataManager[ModelSchema]):
         models = await self.get_all(stmt)
         return [ModelSchema(**model.model_dump()) for model in models]
 
+    async def get_model_versions(self) -> dict[str, str | None]:
+        from backend_api.models.models import Model
+        stmt = select(Model.slug, Model.version)
+
+        return dict((await self.session.execute(stmt)).tuples().all())
+
+    async def upsert_models(self, create_models: list[CreateModelSchema]) -> UpsertResult:
+        from backend_api.models.models import Model
+
+        # `run_count` and `is_active` are only set when a model is first created
+        return await self.bulk_upsert(
+            [Model(**create_model.model_dump()) for create_model in create_models],
+            conflict_cols=["slug"],
+            update_cols=[
+                "category_id",
+                "name",
+                "description",
+                "image_url",
+                "default_example",
+                "latest_version",
+                "version",
+            ],
+            touch_cols=["updated_at"],
+        )
+
+    async def deactivate_missing(self, category_ids: list[int], slugs: set[str]) -> int:
+        """Deactivate active models of `category_ids` whose slug is not in `slugs`."""
+        from backend_api.models.models import Model
+        if not category_ids:
+            return 0
+
+        stmt = (
+            update(Model)
+            .where(
+                Model.category_id.in_(category_ids),
+                Model.is_active,
+                Model.slug.not_in(list(slugs)),
+            )
+            .values(is_active=False)
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+        return result.rowcount
+
 
 async def get_model_service(
     session: Annotated[AsyncSession, Depends(get_session)],
@@ -0,0 +1,109 @@
+import asyncio
+import time
+from typing import NamedTuple
+
+from backend_api.backend.logging import get_logger
+from backend_api.services.model_providers import ModelProviderService
+
+logger = get_logger(__name__)
+
+
+class ModelPrice(NamedTuple):
+    sku: str
+    price_per_second: float
+    prediction_time: float
+
+    def cost(self, elapsed_time: float | None) -> float:
+        if elapsed_time is None:
+            elapsed_time = self.prediction_time
+        return self.price_per_second * elapsed_time
+
+
+class PriceTable:
+    """In-memory model slug -> price table used for billing.
+
+    Rebuilt in the background by the `update_price_table` job, so pricing a run
+    is a dict lookup and keeps working while the provider gateway is down.
+    """
+
+    def __init__(self) -> None:
+        self._prices: dict[str, ModelPrice] = {}
+        self.updated_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._prices)
+
+    def get(self, model_slug: str) -> ModelPrice | None:
+        return self._prices.get(model_slug)
+
+    def set(self, model_slug: str, price: ModelPrice) -> None:
+        self._prices[model_slug] = price
+
+    def replace(self, prices: dict[str, ModelPrice]) -> None:
+        self._prices = prices
+        self.updated_at = time.time()
+
+
+async def get_hardware_prices(service: ModelProviderService, provider: str) -> dict[str, float]:
+    """Price per second of every hardware SKU."""
+    hardware_costs = await service.get_hardware_costs(provider)
+    return {
+        hardware.sku: hardware.price_per_second
+        for hardware in hardware_costs.info
+        if hardware.sku is not None and hardware.price_per_second is not None
+    }
+
+
+async def load_model_price(
+    service: ModelProviderService,
+    provider: str,
+    model_slug: str,
+    hardware_prices: dict[str, float] | None = None,
+) -> ModelPrice | None:
+    """Price of a model, or `None` when the gateway has no complete cost info for it."""
+    model_costs = await service.get_model_costs(provider, model_slug)
+    info = model_costs.info
+    if info is None or info.sku is None or info.prediction_time is None:
+        return None
+    if hardware_prices is None:
+        hardware_prices = await get_hardware_prices(service, provider)
+    price_per_second = hardware_prices.get(info.sku)
+    if price_per_second is None:
+        return None
+    return ModelPrice(
+        sku=info.sku, price_per_second=price_per_second, prediction_time=info.prediction_time
+    )
+
+
+async def build_prices(
+    service: ModelProviderService,
+    provider: str,
+    model_slugs: list[str],
+    concurrency: int,
+    previous: PriceTable | None = None,
+) -> dict[str, ModelPrice]:
+    """Price every model, keeping the `previous` price of models that failed to load."""
+    hardware_prices = await get_hardware_prices(service, provider)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def load(model_slug: str) -> ModelPrice | None:
+        async with semaphore:
+            try:
+                return await load_model_price(service, provider, model_slug, hardware_prices)
+            except Exception as e:
+                logger.error("Failed to load model price", model=model_slug, exc=e)
+                return previous.get(model_slug) if previous is not None else None
+
+    loaded = await asyncio.gather(*(load(model_slug) for model_slug in model_slugs))
+    return {
+        model_slug: price
+        for model_slug, price in zip(model_slugs, loaded)
+        if price is not None
+    }
+
+
+price_table = PriceTable()
+
+
+def get_price_table() -> PriceTable:
+    return price_table
@@ -0,0 +1,131 @@
+import asyncio
+from typing import AsyncIterator
+
+import aiohttp
+from pydantic import ValidationError
+
+from backend_api.backend.config import Settings
+from backend_api.backend.logging import get_logger
+from backend_api.schemas.runs import RunStreamEvent
+from backend_api.services.model_providers import (
+    ModelProviderException,
+    get_model_provider_service,
+)
+
+logger = get_logger(__name__)
+
+FINISHED_STATUSES = ("completed", "failed")
+
+
+class RunWatcher:
+    """Follows a single run upstream and fans its transitions out to every subscriber.
+
+    New subscribers first receive the latest status (and the result, once
+    known), then every later transition. The watcher stops after the result
+    is published or when its last subscriber leaves.
+    """
+
+    def __init__(self, run_id: str, settings: Settings) -> None:
+        self.run_id = run_id
+        self.settings = settings
+        self._subscribers: set[asyncio.Queue[RunStreamEvent | None]] = set()
+        self._latest: dict[str, RunStreamEvent] = {}
+        self.task = asyncio.create_task(self._watch())
+
+    def subscribe(self) -> asyncio.Queue[RunStreamEvent | None]:
+        queue: asyncio.Queue[RunStreamEvent | None] = asyncio.Queue()
+        for event in self._latest.values():
+            queue.put_nowait(event)
+        if self.task.done():
+            queue.put_nowait(None)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue[RunStreamEvent | None]) -> None:
+        self._subscribers.discard(queue)
+        if not self._subscribers:
+            self.task.cancel()
+
+    def _publish(self, event: RunStreamEvent) -> None:
+        self._latest[event.event] = event
+        for queue in self._subscribers:
+            queue.put_nowait(event)
+
+    async def _watch(self) -> None:
+        service = get_model_provider_service()
+        try:
+            status = None
+            while status not in FINISHED_STATUSES:
+                if status is not None:
+                    await asyncio.sleep(self.settings.run_stream_poll_interval)
+                run = await service.run_model_async_status(self.run_id)
+                if run.status != status:
+                    status = run.status
+                    self._publish(RunStreamEvent(event="status", data=run.model_dump(mode="json")))
+
+            result = await service.run_model_async_result(self.run_id)
+            self._publish(RunStreamEvent(event="result", data=result.model_dump(mode="json")))
+        except (
+            ModelProviderException,
+            aiohttp.ClientError,
+            asyncio.TimeoutError,
+            ValidationError,
+        ) as e:
+            logger.error("Unable to follow run", run_id=self.run_id, exc=e)
+            self._publish(RunStreamEvent(event="error", data={"detail": "Unable to follow run"}))
+        finally:
+            for queue in self._subscribers:
+                queue.put_nowait(None)
+
+
+class RunWatcherHub:
+    """Process-wide registry of run watchers, one per run regardless of subscriber count."""
+
+    def __init__(self) -> None:
+        self._watchers: dict[str, RunWatcher] = {}
+
+    def __len__(self) -> int:
+        return len(self._watchers)
+
+    async def subscribe(
+        self, run_id: str, settings: Settings
+    ) -> AsyncIterator[RunStreamEvent | None]:
+        """Yield the run events, or `None` whenever `run_stream_heartbeat` passes without one."""
+        watcher = self._watchers.get(run_id)
+        if watcher is None:
+            watcher = RunWatcher(run_id, settings)
+            watcher.task.add_done_callback(lambda task: self._forget(watcher, task))
+            self._watchers[run_id] = watcher
+
+        queue = watcher.subscribe()
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), settings.run_stream_heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if event is None:
+                    return
+                yield event
+        finally:
+            watcher.unsubscribe(queue)
+
+    def _forget(self, watcher: RunWatcher, task: asyncio.Task) -> None:
+        if self._watchers.get(watcher.run_id) is watcher:
+            del self._watchers[watcher.run_id]
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Run watcher failed", run_id=watcher.run_id, exc=task.exception())
+
+    async def close(self) -> None:
+        watchers = list(self._watchers.values())
+        for watcher in watchers:
+            watcher.task.cancel()
+        await asyncio.gather(*(watcher.task for watcher in watchers), return_exceptions=True)
+
+
+run_watchers = RunWatcherHub()
+
+
+def get_run_watcher_hub() -> RunWatcherHub:
+    return run_watchers
@@ -1,6 +1,11 @@
-from typing import Annotated
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Annotated, Awaitable, Callable, TypeVar
 
+import aiohttp
 from fastapi import Depends, HTTPException
+from pydantic import ValidationError
 
 from backend_api.backend.config import Settings, get_settings
 from backend_api.backend.logging import get_logger
@@ -21,16 +26,35 @@ from backend_api.services.model_providers import (
     get_model_provider_service,
 )
 from backend_api.services.models import ModelService, get_model_service
+from backend_api.services.prices import PriceTable, get_price_table, load_model_price
 from backend_api.services.usage import UsageService, get_usage_service
 from backend_api.services.web3 import Web3Service, get_web3_service
 
 logger = get_logger(__name__)
 
 
+T = TypeVar("T")
+
+
 class RunModelException(Exception):
     pass
 
 
+class PhaseTimings:
+    """Wall time of the phases of a run request, in milliseconds."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+
+    @contextmanager
+    def measure(self, phase: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[phase] = round((time.perf_counter() - start) * 1000, 2)
+
+
 class RunService:
     def __init__(
         self,
@@ -38,11 +62,98 @@ class RunService:
         model_provider_service: ModelProviderService,
         usage_service: UsageService,
         web3_service: Web3Service,
+        price_table: PriceTable,
     ):
         self.settings = settings
         self.model_provider_service = model_provider_service
         self.usage_service = usage_service
         self.web3_service = web3_service
+        self.price_table = price_table
+
+    async def _check_eligibility(
+        self,
+        user: UserSchema,
+        balance_service: BalanceService,
+        model: str,
+        run_query: ModelRunQuery,
+    ) -> None:
+        """Run the on-chain and off-chain balance checks concurrently.
+
+        Raises on the first failed check and cancels the one still running.
+        """
+        checks = {
+            asyncio.create_task(
+                self.web3_service.has_sufficient_balance(user.wallet_address, 10000)
+            ): "Insufficient NFNT balance to run the model",
+            asyncio.create_task(
+                balance_service.has_sufficient_balance(user_id=user.id, required_amount=1)
+            ): "Insufficient balance to run the model",
+        }
+        pending = set(checks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.result():
+                        continue
+                    logger.error(
+                        checks[task],
+                        provider=self.settings.provider,
+                        user=user,
+                        model=model,
+                        run_query=run_query,
+                    )
+                    raise HTTPException(status_code=400, detail=checks[task])
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _dispatch_checked(
+        self,
+        user: UserSchema,
+        balance_service: BalanceService,
+        model: str,
+        run_query: ModelRunQuery,
+        dispatch: Callable[[], Awaitable[T]],
+        timings: PhaseTimings,
+        rollback: Callable[[T], Awaitable[None]] | None = None,
+    ) -> T:
+        """Call the provider once the eligibility checks passed.
+
+        In optimistic mode the provider call starts together with the checks. If
+        one fails, a call that can be rolled back is awaited and rolled back, since
+        the provider has usually accepted it already; any other call is cancelled.
+        """
+        if not self.settings.run_optimistic_dispatch:
+            with timings.measure("checks"):
+                await self._check_eligibility(user, balance_service, model, run_query)
+            with timings.measure("provider"):
+                return await dispatch()
+
+        async def timed_dispatch() -> T:
+            with timings.measure("provider"):
+                return await dispatch()
+
+        provider_task = asyncio.create_task(timed_dispatch())
+        try:
+            with timings.measure("checks"):
+                await self._check_eligibility(user, balance_service, model, run_query)
+        except BaseException:
+            if rollback is None:
+                provider_task.cancel()
+            await asyncio.wait({provider_task})
+            if provider_task.cancelled():
+                pass
+            elif provider_task.exception() is not None:
+                # retrieved here, the check failure is what the caller sees
+                logger.info(
+                    "Provider call failed after a rejected check",
+                    exc_info=provider_task.exception(),
+                )
+            elif rollback is not None:
+                await rollback(provider_task.result())
+            raise
+        return await provider_task
 
     async def run_model(
         self,
@@ -53,54 +164,42 @@ class RunService:
         run_query: ModelRunQuery,
         version: str | None = None,
     ) -> ModelProviderModelRunResult:
-        if not await self.web3_service.has_sufficient_balance(user.wallet_address, 10000):
-            logger.error(
-                "Insufficient NFNT balance to run the model",
-                provider=self.settings.provider,
-                user=user,
-                model=model,
-                run_query=run_query,
-            )
-            raise HTTPException(
-                status_code=400, detail="Insufficient NFNT balance to run the model"
-            )
+        timings = PhaseTimings()
 
-        if not await balance_service.has_sufficient_balance(user_id=user.id, required_amount=1):
-            logger.error(
-                "Insufficient balance to run the model",
+        async def dispatch() -> ModelProviderModelRunResult:
+            logger.info(
+                "Run model started",
                 provider=self.settings.provider,
                 user=user,
                 model=model,
                 run_query=run_query,
             )
-            raise HTTPException(status_code=400, detail="Insufficient balance to run the model")
-        logger.info(
-            "Run model started",
-            provider=self.settings.provider,
-            user=user,
-            model=model,
-            run_query=run_query,
+            try:
+                return await self.model_provider_service.run_model(
+                    self.settings.provider, model, run_query.input, version
+                )
+            except ModelProviderException as e:
+                logger.error("Unable to get result from model run", exc_info=e)
+                raise RunModelException("Unable to run model") from e
+
+        run = await self._dispatch_checked(
+            user, balance_service, model, run_query, dispatch, timings
         )
-        try:
-            run = await self.model_provider_service.run_model(
-                self.settings.provider, model, run_query.input, version
+
+        with timings.measure("track_usage"):
+            await self.track_usage(
+                model,
+                user,
+                run.result.elapsed_time,
+                verify.signature,
             )
-        except ModelProviderException as e:
-            logger.error("Unable to get result from model run", exc_info=e)
-            raise RunModelException("Unable to run model") from e
         logger.info(
             "Run model successfully finished",
             provider=self.settings.provider,
             user=user,
             model=model,
             run=run,
-        )
-
-        await self.track_usage(
-            model,
-            user,
-            run.result.elapsed_time,
-            verify.signature,
+            timings=timings.phases,
         )
 
         return run
@@ -114,40 +213,42 @@ class RunService:
         run_query: ModelRunQuery,
         version: str | None = None,
     ) -> ModelProviderModelRunAsync:
-        if not await self.web3_service.has_sufficient_balance(user.wallet_address, 10000):
-            logger.error(
-                "Insufficient NFNT balance to run the model",
-                provider=self.settings.provider,
-                user=user,
-                model=model,
-                run_query=run_query,
-            )
-            raise HTTPException(
-                status_code=400, detail="Insufficient NFNT balance to run the model"
-            )
-        if not await balance_service.has_sufficient_balance(user_id=user.id, required_amount=1):
-            logger.error(
-                "Insufficient balance to run the model",
-                provider=self.settings.provider,
-                user=user,
-                model=model,
-                run_query=run_query,
-            )
-            raise HTTPException(status_code=400, detail="Insufficient balance to run the model")
-        try:
-            run = await self.model_provider_service.run_model_async(
-                self.settings.provider, model, run_query.input, version
-            )
-        except ModelProviderException as e:
-            logger.error("Unable to run model asynchronically", exc_info=e)
-            raise RunModelException("Unable to run model asynchronically") from e
+        timings = PhaseTimings()
+
+        async def dispatch() -> ModelProviderModelRunAsync:
+            try:
+                return await self.model_provider_service.run_model_async(
+                    self.settings.provider, model, run_query.input, version
+                )
+            except ModelProviderException as e:
+                logger.error("Unable to run model asynchronically", exc_info=e)
+                raise RunModelException("Unable to run model asynchronically") from e
+
+        async def rollback(run: ModelProviderModelRunAsync) -> None:
+            try:
+                await self.model_provider_service.cancel_run(run.id)
+            except ModelProviderException as e:
+                logger.error("Unable to cancel run", run_id=run.id, exc_info=e)
+
+        run = await self._dispatch_checked(
+            user, balance_service, model, run_query, dispatch, timings, rollback
+        )
 
         # track usage
-        await self.track_usage(
-            model,
-            user,
-            elapsed_time=None,
-            signature=verify.signature,
+        with timings.measure("track_usage"):
+            await self.track_usage(
+                model,
+                user,
+                elapsed_time=None,
+                signature=verify.signature,
+            )
+        logger.info(
+            "Run model started asynchronically",
+            provider=self.settings.provider,
+            user=user,
+            model=model,
+            run_id=run.id,
+            timings=timings.phases,
         )
 
         return run
@@ -167,18 +268,23 @@ class RunService:
             raise RunModelException("Unable to get run result") from e
 
     async def _calculate_cost(self, provider: str, model: str, elapsed_time: float | None) -> float:
-        try:
-            model_costs = await self.model_provider_service.get_model_costs(provider, model)
-            if elapsed_time is None:
-                elapsed_time = model_costs.info.prediction_time
-            hardware_costs = await self.model_provider_service.get_hardware_costs(provider)
-            for hardware in filter(lambda x: x.sku == model_costs.info.sku, hardware_costs.info):
-                cost = hardware.price_per_second * elapsed_time
-                return cost
-        except ModelProviderException:
-            return self.settings.default_model_cost
-        finally:
-            return self.settings.default_model_cost
+        price = self.price_table.get(model)
+        if price is None:
+            # not priced by the refresh job yet, e.g. a model added since the last run
+            try:
+                price = await load_model_price(self.model_provider_service, provider, model)
+            except (
+                ModelProviderException,
+                aiohttp.ClientError,
+                asyncio.TimeoutError,
+                ValidationError,
+            ) as e:
+                # the model already ran, bill the default cost rather than failing the request
+                logger.error("Unable to get model price", model=model, exc_info=e)
+            if price is None:
+                return self.settings.default_model_cost
+            self.price_table.set(model, price)
+        return price.cost(elapsed_time)
 
     async def track_usage(
         self,
@@ -208,10 +314,12 @@ async def get_run_service(
     model_provider_service: Annotated[ModelProviderService, Depends(get_model_provider_service)],
     usage_service: Annotated[UsageService, Depends(get_usage_service)],
     web3_service: Annotated[Web3Service, Depends(get_web3_service)],
+    price_table: Annotated[PriceTable, Depends(get_price_table)],
 ):
     return RunService(
         settings=settings,
         model_provider_service=model_provider_service,
         usage_service=usage_service,
         web3_service=web3_service,
+        price_table=price_table,
     )
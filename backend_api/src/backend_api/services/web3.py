@@ -1,161 +1,407 @@
+import asyncio
+from collections import Counter, deque
 from datetime import datetime
 from enum import Enum
-from typing import Annotated, Any
+from typing import Annotated, Any, Iterable, Iterator
 
+from aiocache import SimpleMemoryCache
+from eth_abi.codec import ABICodec
 from eth_typing import ChecksumAddress
 from fastapi import Depends
 from hexbytes import HexBytes
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import SQLAlchemyError
-from sqlmodel import col, select
+from sqlmodel import func, select
 from web3 import AsyncWeb3
-from web3.contract.async_contract import AsyncContractEvent
-from web3.datastructures import AttributeDict
-from web3.types import BlockData
+from web3.types import LogReceipt
 
 from backend_api.backend.config import Settings, get_settings
 from backend_api.backend.logging import get_logger
+from backend_api.cache import BoundedStatsPlugin
 from backend_api.backend.session import AsyncSession, get_session
-from backend_api.exceptions.web3 import (
-    Web3UnableToDetermineBlock,
-)
-from backend_api.models.web3 import Web3Event
-from backend_api.schemas.web3 import (
-    CreateWeb3Event as CreateWeb3EventSchema,
-)
+from backend_api.models.web3 import Web3BlockCursor, Web3Event
 from backend_api.schemas.web3 import (
     Web3Event as Web3EventSchema,
 )
 from backend_api.services.base import BaseDataManager, BaseService
-from backend_api.services.etherscan import EtherscanService
+from backend_api.services.contracts import EventIndex, contracts, to_checksum_address
+from backend_api.services.web3_client import Web3Client, get_web3_client
 
 logger = get_logger(__name__)
 
+TRANSFER_TOPIC = AsyncWeb3.keccak(text="Transfer(address,address,uint256)").hex()
+BALANCE_OF_SELECTOR = AsyncWeb3.keccak(text="balanceOf(address)")[:4]
+# lower-cased fragments of the errors nodes return for a too wide `eth_getLogs` range
+LOG_RANGE_ERROR_MARKERS = (
+    "more than 10000 results",
+    "response size exceeded",
+    "block range",
+    "too many",
+    "limit exceeded",
+)
+
+# NFNT balance per lower-cased wallet address, shared by every Web3Service
+nfnt_balances_stats = BoundedStatsPlugin("nfnt_balances", max_size=10000)
+nfnt_balance_cache = SimpleMemoryCache(plugins=[nfnt_balances_stats])
+
+
+# `web3_events` columns in table order, the layout of the rows built by `iter_event_rows`
+WEB3_EVENT_COLUMNS = tuple(Web3Event.__table__.columns.keys())  # type: ignore[attr-defined]
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return f"0x{value.hex()}"
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _json_value(item) for key, item in value.items()}
+    return value
+
+
+def iter_event_rows(
+    logs: Iterable[LogReceipt],
+    event_index: EventIndex,
+    codec: ABICodec,
+    chunk_size: int,
+    counts: Counter | None = None,
+) -> Iterator[list[tuple]]:
+    """
+    Decode logs into insert-ready `web3_events` rows, `chunk_size` rows at a time.
+
+    Logs are consumed lazily and only the current chunk is held, so a backfill
+    never keeps the converted rows of a whole window in memory. Logs of events
+    missing from `event_index` are skipped. When given, `counts` is updated
+    with the number of rows per event name.
+    """
+    now = datetime.now()
+    chunk: list[tuple] = []
+    for log in logs:
+        event = event_index.for_log(log)
+        if event is None:
+            continue
+        args = event.decode_args(codec, log)
+        for name, value in args.items():
+            if not isinstance(value, (int, str)):
+                args[name] = _json_value(value)
+        transaction_hash = log["transactionHash"].hex()
+        chunk.append(
+            (
+                f"{transaction_hash}:{log['logIndex']}",
+                log["blockNumber"],
+                transaction_hash,
+                log["logIndex"],
+                log["address"],
+                event.name,
+                event.topic0,
+                args,
+                now,
+                now,
+            )
+        )
+        if counts is not None:
+            counts[event.name] += 1
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
 
 class Web3Service(BaseService[Web3Event]):
     def __init__(
         self,
         session: AsyncSession,
         settings: Settings,
+        w3: AsyncWeb3,
     ) -> None:
         super().__init__(session)
         self.settings = settings
-
-    def _get_w3_client(self):
-        return AsyncWeb3(AsyncWeb3.AsyncHTTPProvider(self.settings.infura_base_url))
-
-    async def __aenter__(self):
-        self.w3 = self._get_w3_client()
-        await self.w3.is_connected()
-
-        return self
-
-    async def __aexit__(self, *args, **kwargs):
-        pass
+        self.w3 = w3
 
     @staticmethod
     def _normalize_contract_address(address: str) -> ChecksumAddress:
-        return AsyncWeb3.to_checksum_address(address)
+        return to_checksum_address(address)
 
     async def _get_contract(self):
-        return self.w3.eth.contract(
-            address=self._normalize_contract_address(self.settings.contract_address),
-            abi=self.settings.contract_abi,
-        )
+        return contracts.get(self.w3, self.settings.contract_address)
 
     @staticmethod
-    def attribute_dict_to_dict(attr_dict) -> dict:
-        def _validate_value(item: Any) -> Any:
-            if isinstance(item, HexBytes):
-                return item.hex()
-            return item
-
-        if isinstance(attr_dict, AttributeDict):
-            return {
-                k: _validate_value(Web3Service.attribute_dict_to_dict(v))
-                for k, v in attr_dict.items()
-            }
-        elif isinstance(attr_dict, list):
-            return [Web3Service.attribute_dict_to_dict(item) for item in attr_dict]  # type: ignore
-        else:
-            return attr_dict
-
-    async def _get_block(self, block_number) -> BlockData:
-        return await self.w3.eth.get_block(block_number)
-
-    async def add_events(self):
+    def _is_log_range_error(error: Exception) -> bool:
+        message = str(error).lower()
+        return any(marker in message for marker in LOG_RANGE_ERROR_MARKERS)
+
+    async def _get_logs(
+        self, address: ChecksumAddress, topics: list, from_block: int, to_block: int
+    ) -> list[LogReceipt]:
         """
-        Adds events from a specified block or the latest block to the database.
+        Get the logs of `address` matching `topics` between two blocks, both inclusive.
 
-        Retrieves the contract using the contract address from settings, then determines the block to start
-        fetching events from. If no block is specified, it starts from the latest block or the block number retrieved
-        from the last recorded event in the database. For each event in the contract, the method creates a filter
-        and collects all event entries from the specified block. These events are added to the database.
+        The range is queried in windows of at most `web3_logs_block_range` blocks.
+        A window the node refuses as too large is halved and retried, and the window
+        grows back after each successful query.
+        """
+        max_range = self.settings.web3_logs_block_range
+        block_range = max_range
+        logs: list[LogReceipt] = []
+        start = from_block
+        while start <= to_block:
+            end = min(start + block_range - 1, to_block)
+            try:
+                logs.extend(
+                    await self.w3.eth.get_logs(
+                        {"address": address, "fromBlock": start, "toBlock": end, "topics": topics}
+                    )
+                )
+            except ValueError as error:
+                if start == end or not self._is_log_range_error(error):
+                    raise
+                block_range = (end - start + 1) // 2
+                logger.info("Shrinking logs block range", block_range=block_range, error=str(error))
+                continue
+            start = end + 1
+            block_range = min(block_range * 2, max_range)
+        return logs
+
+    async def _get_cursor(self, manager: "Web3EventManager", address: str, head: int) -> int:
+        cursor = await manager.get_cursor(address)
+        if cursor is None and self.settings.web3_start_block is not None:
+            cursor = self.settings.web3_start_block - 1
+        if cursor is None:
+            # no cursor yet, resume from the stored events or start at the confirmed head
+            cursor = await manager.get_last_block_number()
+        if cursor is None:
+            cursor = head - 1
+        return cursor
+
+    async def add_events(self) -> int:
+        """
+        Stores the contract events of the confirmed blocks after the block cursor.
+
+        Only blocks with `web3_confirmations` confirmations are read, and the last
+        `web3_reorg_window` blocks before the cursor are read again so events moved
+        by a reorg are rewritten. A gap after the cursor is split into block windows,
+        each read with a single `eth_getLogs` filtered by the topic0 of every event
+        in the ABI and decoded locally. Up to `web3_backfill_concurrency` windows are
+        fetched ahead while the current one is upserted together with the cursor, in
+        order, so the cursor never skips a block and stops at the first failure.
 
-        Raises:
-            Web3UnableToDetermineBlock: If the block number cannot be determined.
+        Returns:
+            int: The number of events stored.
         """
         contract = await self._get_contract()
+        event_index = contracts.events(contract.address)
+        topics = [event_index.topics]
 
         manager = Web3EventManager(self.session)
-        from_block = await manager.get_last_block_number()
-
-        block = await self._get_block(from_block or "latest")
-        block_number = block.get("number")
-        if block_number is None:
-            raise Web3UnableToDetermineBlock("Could not get block number")
-
-        await logger.info(f"Adding events from block {block_number}", block_number=block_number)
-
-        for event in contract.events._events:
-            event_name = event.get("name")
-            if event_name is None:
-                continue
-            contract_event: AsyncContractEvent = getattr(contract.events, event_name)
-            event_filter = contract_event.create_filter(fromBlock=block_number - 3)
-
-            events = await event_filter.get_all_entries()
+        to_block = await self.w3.eth.block_number - self.settings.web3_confirmations
+        cursor = await self._get_cursor(manager, contract.address, to_block)
+        if to_block <= cursor:
+            return 0
+        from_block = max(cursor + 1 - self.settings.web3_reorg_window, 0)
+        to_block = min(to_block, cursor + self.settings.web3_backfill_max_blocks)
+
+        block_range = self.settings.web3_logs_block_range
+        windows = [
+            (start, min(start + block_range - 1, to_block))
+            for start in range(from_block, to_block + 1, block_range)
+        ]
+        logger.info(
+            f"Adding events from block {from_block} to {to_block}",
+            from_block=from_block,
+            to_block=to_block,
+            windows=len(windows),
+        )
 
-            try:
-                await manager.add_events(
-                    [
-                        CreateWeb3EventSchema(**event)
-                        for event in self.attribute_dict_to_dict(events)
-                    ]
+        # fetch at most `web3_backfill_concurrency` windows ahead of the one being saved,
+        # so only those logs are held and every window advances the cursor when saved
+        windows_iter = iter(windows)
+        prefetched: deque[tuple[int, int, asyncio.Task[list[LogReceipt]]]] = deque()
+
+        def prefetch() -> None:
+            while len(prefetched) < self.settings.web3_backfill_concurrency:
+                window = next(windows_iter, None)
+                if window is None:
+                    return
+                start, end = window
+                task = asyncio.create_task(self._get_logs(contract.address, topics, start, end))
+                prefetched.append((start, end, task))
+
+        added: Counter = Counter()
+        try:
+            prefetch()
+            while prefetched:
+                start, end, task = prefetched.popleft()
+                try:
+                    logs = await task
+                except Exception as e:
+                    logger.error("Error getting events", from_block=start, to_block=end, error=e)
+                    break
+                prefetch()
+                window_added: Counter = Counter()
+                rows = iter_event_rows(
+                    logs,
+                    event_index,
+                    self.w3.codec,
+                    self.settings.web3_events_chunk_size,
+                    window_added,
                 )
-            except SQLAlchemyError as e:
-                await logger.error("Error adding event", error=e)
-
-            await logger.info(
-                f"Added {len(events)} events for {event_name}",
-                len_events=len(events),
-                event_name=event_name,
-            )
+                try:
+                    await manager.save_events(contract.address, rows, block_number=end)
+                except SQLAlchemyError as e:
+                    await self.session.rollback()
+                    logger.error("Error adding events", from_block=start, to_block=end, error=e)
+                    break
+                added.update(window_added)
+        finally:
+            for _, _, task in prefetched:
+                task.cancel()
+            await asyncio.gather(*(task for _, _, task in prefetched), return_exceptions=True)
+
+        logger.info(
+            f"Added {sum(added.values())} events",
+            len_events=sum(added.values()),
+            events=dict(added),
+        )
+        return sum(added.values())
 
     async def get_balance(self, address: str) -> int:
         """
         Get the balance of the specified address in NFNT.
 
+        Served from a short-lived per-wallet cache, invalidated when a transfer
+        involving the wallet is seen by `invalidate_transferred_balances`.
+
         Args:
             address (str): The address to query the balance for.
 
         Returns:
             int: The balance of the address in NFNT.
         """
-
-        nfnt_address: str = self.settings.nfnt_contract_address
-        balance_nfnt_tokens: int = 0
+        balance = await nfnt_balance_cache.get(address.lower())
+        if balance is not None:
+            return balance
         try:
-            checksum_address = self._normalize_contract_address(nfnt_address)
-            async with EtherscanService(settings=self.settings) as etherscan_service:
-                abi: dict = await etherscan_service.get_contract_abi(contract_address=nfnt_address)
+            balance = await self._fetch_balance(address)
+        except Exception as error:
+            logger.error(f"Getting NFNT balance for {address=}, {error=}")
+            return 0
+        await nfnt_balance_cache.set(
+            address.lower(), balance, ttl=self.settings.nfnt_balance_cache_ttl
+        )
+        return balance
 
-                nfnt_contract = self.w3.eth.contract(address=checksum_address, abi=abi)
-                balance_nfnt = await nfnt_contract.functions.balanceOf(address).call()
+    async def _fetch_balance(self, address: str) -> int:
+        nfnt_contract = contracts.get(self.w3, self.settings.nfnt_contract_address)
+        balance_nfnt = await nfnt_contract.functions.balanceOf(
+            self._normalize_contract_address(address)
+        ).call()
 
-                balance_nfnt_tokens = int(balance_nfnt / 1e18)
-        except Exception as error:
-            await logger.error(f"Getting NFNT balance for {address=}, {error=}")
-        return balance_nfnt_tokens
+        return balance_nfnt // 10**18
+
+    async def get_balances(self, addresses: list[str]) -> dict[str, int]:
+        """
+        Get the NFNT balances of many addresses at once.
+
+        Cached wallets are served from the per-wallet cache, the rest are read with
+        Multicall3 `aggregate3`, one `eth_call` per `multicall3_max_calldata_bytes`
+        of calldata.
+
+        Args:
+            addresses (list[str]): The addresses to query the balances for.
+
+        Returns:
+            dict[str, int]: The balance in NFNT per lower-cased address. Addresses
+            whose balance could not be read are left out.
+        """
+        wallets = list(dict.fromkeys(address.lower() for address in addresses))
+        cached = await nfnt_balance_cache.multi_get(wallets)
+        balances = {
+            wallet: balance for wallet, balance in zip(wallets, cached) if balance is not None
+        }
+        missing = [wallet for wallet in wallets if wallet not in balances]
+        if not missing:
+            return balances
+
+        chunks = list(self._chunk_balance_calls(missing))
+        results = await asyncio.gather(
+            *(self._fetch_balances(chunk) for chunk in chunks), return_exceptions=True
+        )
+        fetched = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Getting NFNT balances for {len(chunk)} wallets, error={result!r}")
+                continue
+            fetched.update(result)
+
+        if fetched:
+            await nfnt_balance_cache.multi_set(
+                list(fetched.items()), ttl=self.settings.nfnt_balance_cache_ttl
+            )
+        balances.update(fetched)
+        return balances
+
+    def _chunk_balance_calls(self, wallets: list[str]) -> Iterator[list[str]]:
+        # abi-encoded `aggregate3(Call3[])`: selector, array offset and length, then per call
+        # a tuple offset, target, allowFailure, callData offset and length and the padded
+        # 36-byte `balanceOf` calldata
+        header_size, call_size = 4 + 2 * 32, 5 * 32 + 64
+        per_chunk = max(1, (self.settings.multicall3_max_calldata_bytes - header_size) // call_size)
+        for start in range(0, len(wallets), per_chunk):
+            yield wallets[start : start + per_chunk]
+
+    async def _fetch_balances(self, wallets: list[str]) -> dict[str, int]:
+        nfnt_address = self._normalize_contract_address(self.settings.nfnt_contract_address)
+        multicall = contracts.get(self.w3, self.settings.multicall3_address)
+        # `balanceOf(address)` calldata is encoded by hand, it is a fixed 36 bytes
+        calls = [
+            (nfnt_address, True, BALANCE_OF_SELECTOR + bytes(12) + bytes.fromhex(wallet[2:]))
+            for wallet in wallets
+        ]
+        results = await multicall.functions.aggregate3(calls).call()
+        return {
+            wallet: int.from_bytes(return_data[:32], "big") // 10**18
+            for wallet, (success, return_data) in zip(wallets, results)
+            if success and len(return_data) >= 32
+        }
+
+    async def prefetch_balances(self, addresses: list[str]) -> None:
+        """Load the NFNT balances of the wallets that are not cached yet."""
+        await self.get_balances(addresses)
+
+    async def invalidate_transferred_balances(self) -> int:
+        """
+        Drop the cached balances of wallets involved in NFNT transfers after the
+        transfers cursor, then move the cursor to the latest block.
+
+        The cursor is kept in `web3_block_cursors` under `<nfnt address>:transfers`.
+        Without one the scan starts at the latest block, as nothing is cached yet.
+
+        Returns the number of invalidated wallets.
+        """
+        address = self._normalize_contract_address(self.settings.nfnt_contract_address)
+        cursor_key = f"{address}:transfers"
+        manager = Web3EventManager(self.session)
+        latest_block = await self.w3.eth.block_number
+        cursor = await manager.get_cursor(cursor_key)
+        if cursor is None or cursor >= latest_block:
+            await manager.set_cursor(cursor_key, latest_block)
+            await self.session.commit()
+            return 0
+
+        logs = await self._get_logs(address, [TRANSFER_TOPIC], cursor + 1, latest_block)
+        wallets = {
+            f"0x{HexBytes(topic).hex()[-40:]}".lower()
+            for log in logs
+            for topic in log["topics"][1:3]
+        }
+        for wallet in wallets:
+            await nfnt_balance_cache.delete(wallet)
+        if wallets:
+            logger.info("Invalidated NFNT balances", wallets=len(wallets))
+        await manager.set_cursor(cursor_key, latest_block)
+        await self.session.commit()
+        return len(wallets)
 
     async def has_sufficient_balance(self, address: str, amount: int) -> bool:
         balance = await self.get_balance(address)
@@ -176,9 +422,53 @@ class Web3EventService(BaseService[Web3Event]):
 
 class Web3EventManager(BaseDataManager[Web3Event]):
     async def get_last_block_number(self) -> int | None:
-        stmt = select(Web3Event.block_number).order_by(col(Web3Event.created_at).desc())
+        stmt = select(func.max(Web3Event.block_number))
+        return await self.session.scalar(stmt)
+
+    async def get_cursor(self, address: str) -> int | None:
+        stmt = select(Web3BlockCursor.block_number).where(Web3BlockCursor.address == address)
         return await self.session.scalar(stmt)
 
+    async def save_events(
+        self, address: str, rows: Iterable[list[tuple]], block_number: int
+    ) -> None:
+        """
+        Upsert chunks of `web3_events` rows and move the cursor of `address` to
+        `block_number`, all in one transaction.
+
+        Rows are tuples in `WEB3_EVENT_COLUMNS` order, see `iter_event_rows`.
+        """
+        stmt = insert(Web3Event)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Web3Event.event_id],
+            set_={
+                "block_number": stmt.excluded.block_number,
+                "data": stmt.excluded.data,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        # one cached statement executed per chunk, sent as multi-row VALUES batches
+        for chunk in rows:
+            await self.session.execute(stmt, [dict(zip(WEB3_EVENT_COLUMNS, row)) for row in chunk])
+
+        await self.set_cursor(address, block_number)
+        await self.session.commit()
+
+    async def set_cursor(self, address: str, block_number: int) -> None:
+        """Upsert the cursor of `address`, committing is left to the caller."""
+        stmt = insert(Web3BlockCursor).values(
+            address=address, block_number=block_number, updated_at=datetime.now()
+        )
+        await self.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[Web3BlockCursor.address],
+                set_={
+                    "block_number": stmt.excluded.block_number,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+
     async def get_event(self, event_id: str) -> Web3EventSchema | None:
         stmt = select(Web3Event).where(Web3Event.event_id == event_id)
 
@@ -193,21 +483,13 @@ class Web3EventManager(BaseDataManager[Web3Event]):
         models = await self.get_all(stmt)
         return [Web3EventSchema(**model.model_dump()) for model in models]
 
-    async def add_events(self, events: list[CreateWeb3EventSchema]) -> None:
-        await self.add_all([Web3Event(**event.model_dump()) for event in events])
-
-    async def add_event(self, event: CreateWeb3EventSchema) -> Web3EventSchema:
-        model = await self.add_one(Web3Event(**event.model_dump()))
-
-        return Web3EventSchema(**model.model_dump())
-
 
 async def get_web3_service(
     session: Annotated[AsyncSession, Depends(get_session)],
     settings: Annotated[Settings, Depends(get_settings)],
+    web3_client: Annotated[Web3Client, Depends(get_web3_client)],
 ):
-    async with Web3Service(session, settings) as web3_service:
-        yield web3_service
+    return Web3Service(session, settings, web3_client.w3)
 
 
 async def get_web3_event_service(
@@ -0,0 +1,253 @@
+import asyncio
+import time
+from functools import lru_cache
+from typing import Any
+
+import aiohttp
+from web3 import AsyncWeb3
+from web3._utils.encoding import FriendlyJsonSerde, Web3JsonEncoder
+from web3.middleware import async_simple_cache_middleware
+from web3.providers.async_rpc import AsyncHTTPProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+from backend_api.backend.config import Settings, get_settings
+from backend_api.backend.logging import get_logger
+from backend_api.exceptions.web3 import Web3ProviderUnavailable
+from backend_api.schemas.model_providers import ConnectionPoolStats
+
+logger = get_logger(__name__)
+
+
+class CircuitBreaker:
+    """Stops calling the node after repeated failures instead of pinging it per request.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast for `reset_timeout` seconds. The first call after that is let
+    through as a probe: success closes the circuit, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def before_request(self) -> None:
+        if self.state == self.CLOSED:
+            return
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+        # only one probe at a time, everyone else fails fast until it settles
+        if self.state == self.HALF_OPEN and not self.probing:
+            self.probing = True
+            return
+        raise Web3ProviderUnavailable(f"Web3 provider circuit is {self.state}")
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            logger.info("Web3 provider circuit closed")
+        self.state = self.CLOSED
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning("Web3 provider circuit opened", failures=self.failures)
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+
+class PooledAsyncHTTPProvider(AsyncHTTPProvider):
+    """JSON-RPC over a shared aiohttp session, guarded by a circuit breaker.
+
+    Requests made within `batch_window` seconds of each other are sent as one
+    JSON-RPC batch, so concurrent calls (e.g. `asyncio.gather`) share a round-trip.
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        session: aiohttp.ClientSession,
+        breaker: CircuitBreaker,
+        batch_window: float,
+        batch_max_size: int,
+    ) -> None:
+        super().__init__(endpoint_uri)
+        self.session = session
+        self.breaker = breaker
+        self.batch_window = batch_window
+        self.batch_max_size = batch_max_size
+
+        self._pending: list[tuple[dict[str, Any], asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batches: set[asyncio.Task] = set()
+
+    async def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        self.breaker.before_request()
+        request = {
+            "jsonrpc": "2.0",
+            "method": method,
+            "params": params or [],
+            "id": next(self.request_counter),
+        }
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((request, future))
+        if len(self._pending) >= self.batch_max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.batch_window, self._flush
+            )
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if pending:
+            task = asyncio.create_task(self._send(pending))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _send(self, pending: list[tuple[dict[str, Any], asyncio.Future]]) -> None:
+        payload = [request for request, _ in pending]
+        try:
+            async with self.session.post(
+                self.endpoint_uri,
+                data=FriendlyJsonSerde().json_encode(
+                    payload if len(payload) > 1 else payload[0], cls=Web3JsonEncoder
+                ),
+                headers=self.get_request_headers(),
+            ) as response:
+                response.raise_for_status()
+                raw_response = await response.read()
+            decoded = self.decode_rpc_response(raw_response)
+        except Exception as error:
+            # any failure must reach the callers, or they wait on their futures forever
+            self.breaker.record_failure()
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        self.breaker.record_success()
+        responses = decoded if isinstance(decoded, list) else [decoded]
+        by_id = {response.get("id"): response for response in responses}
+        for request, future in pending:
+            if future.done():
+                continue
+            response = by_id.get(request["id"])
+            if response is None and len(pending) == 1:
+                # a node may answer a single request with an id-less error object
+                response = responses[0]
+            if response is None:
+                future.set_exception(
+                    Web3ProviderUnavailable(f"No response for JSON-RPC request {request['id']}")
+                )
+            else:
+                future.set_result(response)
+
+
+class Web3Client:
+    """App-lifespan web3 client shared by request handlers and scheduled tasks.
+
+    Replaces building an `AsyncWeb3` and pinging the node with `is_connected()`
+    on every request: one keep-alive connection pool is reused, node health is
+    tracked by a circuit breaker and concurrent calls are batched.
+    """
+
+    NAME = "web3"
+
+    def __init__(self, settings: Settings) -> None:
+        self.settings = settings
+        self._connector: aiohttp.TCPConnector | None = None
+        self._session: aiohttp.ClientSession | None = None
+        self._w3: AsyncWeb3 | None = None
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.web3_breaker_failure_threshold,
+            reset_timeout=settings.web3_breaker_reset_timeout,
+        )
+
+        self.queued = 0
+        self.queued_time = 0.0
+
+    def open(self) -> None:
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_queued_start.append(self._on_connection_queued_start)
+        trace_config.on_connection_queued_end.append(self._on_connection_queued_end)
+        self._connector = aiohttp.TCPConnector(
+            limit=self.settings.web3_pool_limit,
+            limit_per_host=self.settings.web3_pool_limit,
+            keepalive_timeout=self.settings.web3_keepalive_timeout,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=self._connector,
+            timeout=aiohttp.ClientTimeout(total=self.settings.web3_request_timeout),
+            trace_configs=[trace_config],
+        )
+        provider = PooledAsyncHTTPProvider(
+            self.settings.infura_base_url,
+            session=self._session,
+            breaker=self.breaker,
+            batch_window=self.settings.web3_batch_window,
+            batch_max_size=self.settings.web3_batch_max_size,
+        )
+        self._w3 = AsyncWeb3(provider)
+        # `eth_chainId` is otherwise re-requested before every `eth_call`
+        self._w3.middleware_onion.add(async_simple_cache_middleware, "simple_cache")
+        logger.info("Web3 client opened", limit=self._connector.limit)
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+        self._session = None
+        self._connector = None
+        self._w3 = None
+        logger.info("Web3 client closed")
+
+    @property
+    def w3(self) -> AsyncWeb3:
+        if self._w3 is None:
+            raise Web3ProviderUnavailable("Web3 client is not open")
+        return self._w3
+
+    async def _on_connection_queued_start(self, session, trace_config_ctx, params):
+        trace_config_ctx.queued_start = time.time()
+
+    async def _on_connection_queued_end(self, session, trace_config_ctx, params):
+        waited = time.time() - trace_config_ctx.queued_start
+        self.queued += 1
+        self.queued_time += waited
+        logger.warning("Web3 connection pool saturated", waited=waited)
+
+    def stats(self) -> ConnectionPoolStats:
+        idle = active = waiting = 0
+        if self._connector is not None:
+            idle = sum(len(conns) for conns in self._connector._conns.values())
+            active = len(self._connector._acquired)
+            waiting = sum(len(waiters) for waiters in self._connector._waiters.values())
+        return ConnectionPoolStats(
+            name=self.NAME,
+            max_connections=self.settings.web3_pool_limit,
+            max_connections_per_host=self.settings.web3_pool_limit,
+            idle=idle,
+            active=active,
+            waiting=waiting,
+            queued=self.queued,
+            queued_time=self.queued_time,
+        )
+
+
+@lru_cache
+def get_web3_client() -> Web3Client:
+    return Web3Client(get_settings())
@@ -1,7 +1,13 @@
 from .update_categories import update_categories
 from .update_models import update_models
+from .update_price_table import update_price_table
+from .update_web3_events import update_web3_events
+from .warm_model_costs import warm_model_costs
 
 __all__ = (
     'update_categories',
     'update_models',
+    'update_price_table',
+    'update_web3_events',
+    'warm_model_costs',
 )
@@ -0,0 +1,11 @@
+from backend_api.backend.session import get_session
+from backend_api.services.models import ModelService, get_model_service
+
+
+async def get_active_model_slugs() -> list[str]:
+    """Slugs of the active models, read in a session of their own."""
+    async for session in get_session():
+        service: ModelService = await get_model_service(session)
+
+        return await service.get_active_model_slugs()
+    return []
@@ -4,14 +4,11 @@ from backend_api.backend.tasks import scheduler
 from backend_api.schemas.categories import CreateCategory
 from backend_api.schemas.model_providers import ModelProviderCategoryList
 from backend_api.services.categories import CategoryService, get_category_service
-from backend_api.services.model_providers import ModelProviderService
-from backend_api.backend.config import get_settings
+from backend_api.services.model_providers import get_model_provider_service
 
 
 async def _get_categories() -> ModelProviderCategoryList:
-    settings = get_settings()
-    async with ModelProviderService(settings) as service:
-        return await service.list_categories()
+    return await get_model_provider_service().list_categories()
 
 
 @scheduler.scheduled_job('interval', weeks=1, next_run_time=datetime.now())
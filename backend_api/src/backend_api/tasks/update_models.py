@@ -1,22 +1,31 @@
+import asyncio
+import time
 from datetime import datetime
+
 from backend_api.backend.config import get_settings
 from backend_api.backend.session import get_session
 from backend_api.backend.tasks import scheduler
+from backend_api.schemas.categories import Category as CategorySchema
 from backend_api.schemas.categories import CategoryList as CategoryListSchema
 from backend_api.schemas.model_providers import ModelProviderModelList
 from backend_api.schemas.models import (
     CreateModel as CreateModelSchema,
 )
-from backend_api.schemas.models import (
-    UpdateModel as UpdateModelSchema,
-)
+from backend_api.schemas.models import ModelSyncReport
 from backend_api.services.categories import CategoryService, get_category_service
-from backend_api.services.model_providers import ModelProviderService
+from backend_api.services.model_providers import (
+    ModelProviderException,
+    get_model_provider_service,
+)
 from backend_api.services.models import ModelService, get_model_service
 from backend_api.backend.logging import get_logger
 
 logger = get_logger(__name__)
 
+FETCH_CONCURRENCY = 4
+FETCH_ATTEMPTS = 3
+FETCH_TIMEOUT = 30
+
 
 async def _get_categories() -> CategoryListSchema:
     async for session in get_session():
@@ -28,31 +37,102 @@ async def _get_categories() -> CategoryListSchema:
 
 async def _get_models(category_slug: str) -> ModelProviderModelList:
     settings = get_settings()
-    async with ModelProviderService(settings) as service:
-        return await service.list_models(settings.provider, category_slug)
+    service = get_model_provider_service()
+    return await service.list_models(
+        settings.provider, category_slug, timeout=FETCH_TIMEOUT, attempts=FETCH_ATTEMPTS
+    )
+
+
+async def _fetch_models(
+    categories: list[CategorySchema],
+) -> tuple[dict[str, CreateModelSchema], list[CategorySchema]]:
+    """
+    List the models of every category, `FETCH_CONCURRENCY` at a time.
+
+    Every category is tried up to `FETCH_ATTEMPTS` times, `FETCH_TIMEOUT` seconds
+    each, over the shared provider API client. Returns the models by slug (a model
+    listed in several categories belongs to the last one) and the categories that
+    failed to load.
+    """
+    semaphore = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def fetch(category: CategorySchema) -> ModelProviderModelList:
+        async with semaphore:
+            return await _get_models(category.slug)
+
+    results = await asyncio.gather(
+        *(fetch(category) for category in categories), return_exceptions=True
+    )
+    models: dict[str, CreateModelSchema] = {}
+    failed = []
+    for category, result in zip(categories, results):
+        if isinstance(result, BaseException):
+            logger.error("Failed to list models", category=category.slug, exc=result)
+            failed.append(category)
+            continue
+        for model in result.models:
+            models[model.slug] = CreateModelSchema(category_id=category.id, **model.model_dump())
+    return models, failed
+
+
+async def _invalidate_model_refs(model_slugs: list[str]):
+    settings = get_settings()
+    service = get_model_provider_service()
+    for model_slug in model_slugs:
+        try:
+            await service.invalidate_model_ref(settings.provider, model_slug)
+        except ModelProviderException as e:
+            logger.error("Failed to invalidate model ref", model=model_slug, exc=e)
 
 
 @scheduler.scheduled_job("interval", days=1, next_run_time=datetime.now())
-async def update_models():
+async def update_models() -> ModelSyncReport:
+    """
+    Sync the model catalog with the provider.
+
+    Models are created or updated with one upsert per category. Active models no
+    longer listed in a category are deactivated, unless that category failed to
+    load or came back empty. Cached refs of models with a new version are dropped.
+    """
+    report = ModelSyncReport()
+    started = time.perf_counter()
     categories = (await _get_categories()).categories
+    models, failed = await _fetch_models(categories)
+    report.failed_categories = [category.slug for category in failed]
+    report.fetch_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    new_versions = []
     async for session in get_session():
         service: ModelService = await get_model_service(session)
-        for category in categories:
-            for model in (await _get_models(category.slug)).models:
-                existed = await service.get_model_by_slug(model.slug)
-                if existed:
-                    try:
-                        await service.update_model(
-                            UpdateModelSchema(
-                                id=existed.id, category_id=category.id, **model.model_dump()
-                            )
-                        )
-                    except Exception as e:
-                        logger.error("Failed to update model", exc=e)
-                    continue
-                try:
-                    await service.create_model(
-                        CreateModelSchema(category_id=category.id, **model.model_dump())
-                    )
-                except Exception as e:
-                    logger.error("Failed to create model", exc=e)
+        versions = await service.get_model_versions()
+        new_versions = [
+            slug
+            for slug, model in models.items()
+            if slug in versions and versions[slug] != model.version
+        ]
+
+        by_category: dict[int, list[CreateModelSchema]] = {}
+        for model in models.values():
+            by_category.setdefault(model.category_id, []).append(model)
+        for category_id, category_models in by_category.items():
+            try:
+                result = await service.upsert_models(category_models)
+            except Exception as e:
+                await session.rollback()
+                logger.error("Failed to upsert models", category_id=category_id, exc=e)
+                continue
+            report.created += result.inserted
+            report.updated += result.updated
+            report.unchanged += result.unchanged
+
+        report.deactivated = await service.deactivate_missing_models(
+            list(by_category), set(models)
+        )
+    report.new_versions = len(new_versions)
+    report.write_time = time.perf_counter() - started
+    logger.info("Models synced", **report.model_dump())
+
+    if new_versions:
+        await _invalidate_model_refs(new_versions)
+    return report
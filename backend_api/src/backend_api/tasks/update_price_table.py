@@ -0,0 +1,41 @@
+import asyncio
+from datetime import datetime
+
+import aiohttp
+from pydantic import ValidationError
+
+from backend_api.backend.config import get_settings
+from backend_api.backend.tasks import scheduler
+from backend_api.services.model_providers import (
+    ModelProviderException,
+    get_model_provider_service,
+)
+from backend_api.services.prices import build_prices, get_price_table
+from backend_api.backend.logging import get_logger
+from backend_api.tasks.common import get_active_model_slugs
+
+logger = get_logger(__name__)
+
+FETCH_CONCURRENCY = 8
+
+
+@scheduler.scheduled_job("interval", minutes=30, next_run_time=datetime.now())
+async def update_price_table():
+    """Rebuild the in-memory price table used to bill runs."""
+    slugs = await get_active_model_slugs()
+    settings = get_settings()
+    table = get_price_table()
+    try:
+        prices = await build_prices(
+            get_model_provider_service(), settings.provider, slugs, FETCH_CONCURRENCY, table
+        )
+    except (
+        ModelProviderException,
+        aiohttp.ClientError,
+        asyncio.TimeoutError,
+        ValidationError,
+    ) as e:
+        logger.error("Failed to update price table", exc=e)
+        return
+    table.replace(prices)
+    logger.info("Price table updated", models=len(slugs), priced=len(prices))
@@ -2,11 +2,13 @@ from datetime import datetime
 from backend_api.backend.session import get_session
 from backend_api.backend.config import get_settings
 from backend_api.services.web3 import Web3Service
+from backend_api.services.web3_client import get_web3_client
 from backend_api.backend.tasks import scheduler
 
 
 @scheduler.scheduled_job("interval", minutes=1, next_run_time=datetime.now())
 async def update_web3_events():
     async for session in get_session():
-        async with Web3Service(session, get_settings()) as web3_service:
-            await web3_service.add_events()
+        web3_service = Web3Service(session, get_settings(), get_web3_client().w3)
+        await web3_service.add_events()
+        await web3_service.invalidate_transferred_balances()
@@ -0,0 +1,26 @@
+from datetime import datetime
+from backend_api.backend.config import get_settings
+from backend_api.backend.tasks import scheduler
+from backend_api.services.model_providers import (
+    ModelProviderException,
+    get_model_provider_service,
+)
+from backend_api.backend.logging import get_logger
+from backend_api.tasks.common import get_active_model_slugs
+
+logger = get_logger(__name__)
+
+
+@scheduler.scheduled_job("interval", hours=1, next_run_time=datetime.now())
+async def warm_model_costs():
+    """Ask the provider gateway to pre-load cost info for every active model."""
+    slugs = await get_active_model_slugs()
+    if not slugs:
+        return
+    settings = get_settings()
+    try:
+        warmed = await get_model_provider_service().warm_model_costs(settings.provider, slugs)
+    except ModelProviderException as e:
+        logger.error("Failed to warm model costs", exc=e)
+        return
+    logger.info("Model costs warm-up scheduled", models=len(slugs), scheduled=warmed.scheduled)
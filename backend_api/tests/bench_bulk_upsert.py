@@ -0,0 +1,98 @@
+"""Times syncing the model catalog one model at a time against `upsert_models`.
+
+Drops and recreates the `models` and `categories` tables of the given
+database, so point it at a scratch one::
+
+    PYTHONPATH=src python tests/bench_bulk_upsert.py \\
+        --database-url postgresql+asyncpg://postgres@localhost/bench [--rows 5000]
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+
+import conftest  # noqa: F401  settings the backend modules read on import
+import backend_api.models  # noqa: F401
+from backend_api.backend.session import AsyncSession
+from backend_api.models.categories import Category
+from backend_api.models.models import Model
+from backend_api.schemas.models import CreateModel, UpdateModel
+from backend_api.services.models import ModelService
+
+
+def catalog(count: int, seed: int, offset: int = 0) -> list[CreateModel]:
+    versions = random.Random(seed)
+    return [
+        CreateModel(
+            category_id=1,
+            name=f"model-{i}",
+            slug=f"owner/model-{i}",
+            version=f"v{versions.randrange(3)}",
+            description="An example model " * 3,
+            run_count=i,
+            image_url="https://example.com/cover.png",
+            default_example={"input": {"prompt": f"prompt {i}"}, "output": None},
+            latest_version={"id": f"v{i}"},
+        )
+        for i in range(offset, offset + count)
+    ]
+
+
+async def one_at_a_time(service: ModelService, models: list[CreateModel]) -> None:
+    """The sync loop before `upsert_models`, a lookup and a commit per model."""
+    for model in models:
+        existed = await service.get_model_by_slug(model.slug)
+        if existed:
+            await service.update_model(UpdateModel(id=existed.id, **model.model_dump()))
+        else:
+            await service.create_model(model)
+
+
+async def main(database_url: str, count: int) -> None:
+    engine = create_async_engine(database_url)
+    tables = [Category.__table__, Model.__table__]  # type: ignore[attr-defined]
+    Session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)  # type: ignore
+
+    passes = [
+        ("insert", catalog(count, seed=0)),
+        ("unchanged", catalog(count, seed=0)),
+        ("2/3 new versions, 10% new models", catalog(count, 1) + catalog(count // 10, 1, count)),
+    ]
+    for implementation in ("one at a time", "upsert_models"):
+        async with engine.begin() as conn:
+            await conn.run_sync(lambda sync: SQLModel.metadata.drop_all(sync, tables=tables))
+            await conn.run_sync(lambda sync: SQLModel.metadata.create_all(sync, tables=tables))
+            await conn.execute(
+                text(
+                    "INSERT INTO categories (name, slug, is_active, created_at)"
+                    " VALUES ('Example', 'example', true, now())"
+                )
+            )
+        for label, models in passes:
+            async with Session() as session:
+                service = ModelService(session)
+                started = time.perf_counter()
+                if implementation == "upsert_models":
+                    result = await service.upsert_models(models)
+                else:
+                    await one_at_a_time(service, models)
+                    result = None
+                elapsed = time.perf_counter() - started
+            print(
+                f"{implementation:14} {label:33} {len(models):7} models {elapsed:8.2f} s"
+                + (f"  {result}" if result is not None else "")
+            )
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.database_url, args.rows))
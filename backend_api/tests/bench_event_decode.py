@@ -0,0 +1,98 @@
+"""Times decoding contract logs into `web3_events` rows against web3's `get_event_data`.
+
+The logs are synthetic events of the bundled contract ABI, decoded through the
+topic0 index of `services.contracts`::
+
+    PYTHONPATH=src python tests/bench_event_decode.py [--logs 10000]
+"""
+import argparse
+import os
+import random
+import time
+
+from eth_abi import encode
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3._utils.events import get_event_data
+from web3.datastructures import AttributeDict
+
+import conftest  # noqa: F401  settings the backend modules read on import
+from backend_api.backend.config import _get_contract_abi
+from backend_api.services.contracts import EventIndex
+from backend_api.services.web3 import iter_event_rows
+
+ADDRESS = AsyncWeb3.to_checksum_address("0x" + "12" * 20)
+VALUES = {
+    "address": lambda: AsyncWeb3.to_checksum_address("0x" + os.urandom(20).hex()),
+    "uint256": lambda: random.randrange(10**20),
+    "bool": lambda: random.random() < 0.5,
+}
+
+
+def synthetic_logs(event_index: EventIndex, count: int) -> list[AttributeDict]:
+    events = list(event_index.by_name.values())
+    logs = []
+    for i in range(count):
+        event = random.choice(events)
+        topics, types, values = [HexBytes(event.topic0)], [], []
+        for item in event.abi["inputs"]:
+            value = VALUES[item["type"]]()
+            if item["indexed"]:
+                topics.append(HexBytes(encode([item["type"]], [value])))
+            else:
+                types.append(item["type"])
+                values.append(value)
+        logs.append(
+            AttributeDict(
+                {
+                    "address": ADDRESS,
+                    "blockHash": HexBytes(os.urandom(32)),
+                    "blockNumber": 1000 + i // 10,
+                    "data": HexBytes(encode(types, values)),
+                    "logIndex": i % 10,
+                    "removed": False,
+                    "topics": topics,
+                    "transactionHash": HexBytes(os.urandom(32)),
+                    "transactionIndex": 0,
+                }
+            )
+        )
+    return logs
+
+
+def main(count: int, runs: int) -> None:
+    random.seed(1)
+    codec = AsyncWeb3().codec
+    event_index = EventIndex(_get_contract_abi())
+    logs = synthetic_logs(event_index, count)
+
+    def event_rows() -> list[tuple]:
+        return [row for chunk in iter_event_rows(logs, event_index, codec, 1000) for row in chunk]
+
+    def web3_events() -> list:
+        return [get_event_data(codec, event_index.for_log(log).abi, log) for log in logs]
+
+    expected = [dict(event["args"]) for event in web3_events()]
+    # bool and int args are stored as they are, the tuple holds the args at index 7
+    assert [row[7] for row in event_rows()] == expected
+
+    for implementation, decode in (("get_event_data", web3_events), ("event rows", event_rows)):
+        best = min(timed(decode) for _ in range(runs))
+        print(
+            f"{implementation:14} {count} logs  {best * 1000:8.1f} ms"
+            f"  {count / best:10,.0f} logs/s"
+        )
+
+
+def timed(decode) -> float:
+    started = time.perf_counter()
+    decode()
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logs", type=int, default=10000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+    main(args.logs, args.runs)
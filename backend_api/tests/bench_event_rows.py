@@ -0,0 +1,92 @@
+"""Times and sizes turning contract logs into `web3_events` rows, before and after.
+
+Before, every decoded event of a window went through the recursive
+`attribute_dict_to_dict` and was kept until the insert. `iter_event_rows`
+converts the logs lazily, one chunk of rows at a time::
+
+    PYTHONPATH=src python tests/bench_event_rows.py [--logs 50000]
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from typing import Any
+
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3._utils.events import get_event_data
+from web3.datastructures import AttributeDict
+
+from bench_event_decode import synthetic_logs
+from backend_api.backend.config import _get_contract_abi
+from backend_api.services.contracts import EventIndex
+from backend_api.services.web3 import WEB3_EVENT_COLUMNS, iter_event_rows
+
+CHUNK_SIZE = 1000
+
+
+def attribute_dict_to_dict(attr_dict: Any) -> Any:
+    """`Web3Service.attribute_dict_to_dict` before `iter_event_rows` replaced it."""
+
+    def _validate_value(item: Any) -> Any:
+        if isinstance(item, HexBytes):
+            return item.hex()
+        return item
+
+    if isinstance(attr_dict, AttributeDict):
+        return {k: _validate_value(attribute_dict_to_dict(v)) for k, v in attr_dict.items()}
+    elif isinstance(attr_dict, list):
+        return [attribute_dict_to_dict(item) for item in attr_dict]
+    return attr_dict
+
+
+def main(count: int) -> None:
+    random.seed(2)
+    codec = AsyncWeb3().codec
+    event_index = EventIndex(_get_contract_abi())
+    logs = synthetic_logs(event_index, count)
+
+    def recursive() -> int:
+        events = [get_event_data(codec, event_index.for_log(log).abi, log) for log in logs]
+        rows = [
+            {
+                "event_id": f"{event['transactionHash']}:{event['logIndex']}",
+                "event_name": event["event"],
+                "data": event["args"],
+                **event,
+            }
+            for event in attribute_dict_to_dict(events)
+        ]
+        return len(rows)
+
+    def streaming() -> int:
+        rows = 0
+        for chunk in iter_event_rows(logs, event_index, codec, CHUNK_SIZE):
+            # each chunk is one INSERT and is dropped once sent
+            rows += len(chunk)
+            assert len(chunk[0]) == len(WEB3_EVENT_COLUMNS)
+        return rows
+
+    for implementation, convert in (("recursive", recursive), ("event rows", streaming)):
+        convert()  # warms the checksum address cache
+        started = time.perf_counter()
+        rows = convert()
+        elapsed = time.perf_counter() - started
+
+        gc.collect()
+        tracemalloc.start()
+        convert()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{implementation:10} {rows} logs  {rows / elapsed:10,.0f} logs/s"
+            f"  peak {peak / 2**20:7.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logs", type=int, default=50000)
+    args = parser.parse_args()
+    main(args.logs)
@@ -0,0 +1,108 @@
+"""Times reading NFNT balances one `balanceOf` call at a time against `get_balances`.
+
+The node is an in-process JSON-RPC provider answering `balanceOf` and
+Multicall3 `aggregate3` calls after `--rtt` milliseconds, so the numbers show
+what the round trips cost rather than what a node does::
+
+    PYTHONPATH=src python tests/bench_multicall_balances.py [--wallets 10 100 500] [--rtt 20]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from eth_abi import decode, encode
+from hexbytes import HexBytes
+from web3 import AsyncWeb3
+from web3.providers import AsyncBaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+import conftest  # noqa: F401  settings the backend modules read on import
+from backend_api.backend.config import get_settings
+from backend_api.services.contracts import contracts
+from backend_api.services.web3 import (
+    BALANCE_OF_SELECTOR,
+    Web3Service,
+    nfnt_balance_cache,
+)
+
+AGGREGATE3_SELECTOR = AsyncWeb3.keccak(text="aggregate3((address,bool,bytes)[])")[:4]
+
+
+class FakeNode(AsyncBaseProvider):
+    """Answers `eth_call` with a balance derived from the wallet address."""
+
+    def __init__(self, token: str, multicall: str, rtt: float) -> None:
+        super().__init__()
+        self.token = token.lower()
+        self.multicall = multicall.lower()
+        self.rtt = rtt
+        self.calls = 0
+
+    @staticmethod
+    def balance_of(calldata: bytes) -> bytes:
+        wallet = int.from_bytes(calldata[4:36], "big")
+        return encode(["uint256"], [(wallet % 1000) * 10**18])
+
+    async def make_request(self, method: RPCEndpoint, params) -> RPCResponse:
+        if method == "eth_chainId":
+            return {"jsonrpc": "2.0", "id": 0, "result": "0x1"}
+        assert method == "eth_call", method
+        self.calls += 1
+        await asyncio.sleep(self.rtt)
+        to = params[0]["to"].lower()
+        data = HexBytes(params[0]["data"])
+        if to == self.token and data[:4] == BALANCE_OF_SELECTOR:
+            result = self.balance_of(data)
+        elif to == self.multicall and data[:4] == AGGREGATE3_SELECTOR:
+            (calls,) = decode(["(address,bool,bytes)[]"], data[4:])
+            results = [(True, self.balance_of(calldata)) for _, _, calldata in calls]
+            result = encode(["(bool,bytes)[]"], [results])
+        else:
+            raise AssertionError(f"Unexpected call to {to}")
+        return {"jsonrpc": "2.0", "id": 0, "result": HexBytes(result).hex()}
+
+    async def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+
+
+async def main(counts: list[int], rtt: float) -> None:
+    settings = get_settings()
+    contracts.register(settings.nfnt_contract_address, settings.nfnt_contract_abi)
+    contracts.register(settings.multicall3_address, settings.multicall3_abi)
+    node = FakeNode(settings.nfnt_contract_address, settings.multicall3_address, rtt)
+    service = Web3Service(None, settings, AsyncWeb3(node))  # type: ignore[arg-type]
+
+    for count in counts:
+        wallets = ["0x" + os.urandom(20).hex() for _ in range(count)]
+        await nfnt_balance_cache.clear()
+
+        node.calls = 0
+        started = time.perf_counter()
+        expected = {wallet: await service._fetch_balance(wallet) for wallet in wallets}
+        sequential, sequential_calls = time.perf_counter() - started, node.calls
+
+        node.calls = 0
+        started = time.perf_counter()
+        balances = await service.get_balances(wallets)
+        batched, batched_calls = time.perf_counter() - started, node.calls
+        assert balances == expected
+
+        node.calls = 0
+        started = time.perf_counter()
+        await service.get_balances(wallets)
+        cached = time.perf_counter() - started
+
+        print(
+            f"{count:5} wallets  balanceOf {sequential * 1000:8.1f} ms {sequential_calls:4} calls"
+            f"  get_balances {batched * 1000:7.1f} ms {batched_calls:3} calls"
+            f"  cached {cached * 1000:6.2f} ms {node.calls} calls"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--wallets", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--rtt", type=float, default=20, help="milliseconds per eth_call")
+    args = parser.parse_args()
+    asyncio.run(main(args.wallets, args.rtt / 1000))
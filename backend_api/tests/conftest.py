@@ -0,0 +1,18 @@
+import os
+
+# the settings every backend module reads on import, nothing connects to these
+for name, value in {
+    "BACKEND_API_SECRET_KEY": "test-secret",
+    "BACKEND_API_JWT_SECRET": "test-jwt-secret",
+    "BACKEND_API_DATABASE_URL": "postgresql+asyncpg://postgres@localhost/backend_api",
+    "BACKEND_API_PROVIDER_API_URL": "http://provider-api-gateway",
+    "BACKEND_API_PROVIDER_NAME": "replicate",
+    "BACKEND_API_ADMIN_USERNAME": "admin",
+    "BACKEND_API_ADMIN_PASSWORD": "admin",
+    "BACKEND_API_CONTRACT_ADDRESS": "0x" + "12" * 20,
+    "BACKEND_API_INFURA_BASE_URL": "http://localhost:8545",
+    "BACKEND_API_COINGECKO_API_KEY": "test",
+    "BACKEND_API_ETHERSCAN_API_KEY": "test",
+    "BACKEND_API_NFNT_CONTRACT_ADDRESS": "0x" + "34" * 20,
+}.items():
+    os.environ.setdefault(name, value)
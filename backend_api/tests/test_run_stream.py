@@ -0,0 +1,125 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend_api.schemas.model_providers import (
+    ModelProviderModelRunAsyncResult,
+    ModelProviderModelRunAsyncStatus,
+)
+from backend_api.services import run_stream
+from backend_api.services.run_stream import RunWatcherHub
+
+SETTINGS = SimpleNamespace(run_stream_poll_interval=0, run_stream_heartbeat=1)
+
+
+class FakeModelProviderService:
+    """Reports `statuses` one poll at a time, once `released` is set."""
+
+    def __init__(self, statuses: list[str]) -> None:
+        self.statuses = list(statuses)
+        self.released = asyncio.Event()
+        self.status_calls = 0
+
+    async def run_model_async_status(self, run_id: str) -> ModelProviderModelRunAsyncStatus:
+        await self.released.wait()
+        self.status_calls += 1
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        return ModelProviderModelRunAsyncStatus(id=run_id, status=status, created_at=None)
+
+    async def run_model_async_result(self, run_id: str) -> ModelProviderModelRunAsyncResult:
+        return ModelProviderModelRunAsyncResult(
+            id=run_id,
+            status="completed",
+            created_at=None,
+            finished_at=None,
+            result={"error": None, "output": "done", "elapsed_time": 1.5},
+        )
+
+
+class BrokenModelProviderService(FakeModelProviderService):
+    async def run_model_async_status(self, run_id: str) -> ModelProviderModelRunAsyncStatus:
+        # the gateway answered with a body that is not a run status
+        return ModelProviderModelRunAsyncStatus(id=run_id)  # type: ignore[call-arg]
+
+
+@pytest.fixture
+def use_service(monkeypatch):
+    def use(service: FakeModelProviderService) -> FakeModelProviderService:
+        monkeypatch.setattr(run_stream, "get_model_provider_service", lambda: service)
+        return service
+
+    return use
+
+
+async def collect(hub: RunWatcherHub, run_id: str) -> list[tuple[str, dict]]:
+    return [
+        (event.event, event.data)
+        async for event in hub.subscribe(run_id, SETTINGS)  # type: ignore[arg-type]
+        if event is not None
+    ]
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_one_watcher_fans_out_to_every_subscriber(use_service):
+    service = use_service(FakeModelProviderService(["starting", "processing", "completed"]))
+    hub = RunWatcherHub()
+
+    async def run():
+        first = asyncio.create_task(collect(hub, "run-1"))
+        second = asyncio.create_task(collect(hub, "run-1"))
+        await settle()
+        assert len(hub) == 1
+        service.released.set()
+        return await first, await second, len(hub)
+
+    first, second, watchers = asyncio.run(run())
+
+    assert [event for event, _ in first] == ["status", "status", "status", "result"]
+    assert [data.get("status") for _, data in first] == [
+        "starting",
+        "processing",
+        "completed",
+        "completed",
+    ]
+    assert first[-1][1]["result"]["output"] == "done"
+    assert second == first
+    assert service.status_calls == 3
+    assert watchers == 0
+
+
+def test_watcher_stops_when_the_last_subscriber_leaves(use_service):
+    service = use_service(FakeModelProviderService(["starting", "processing"]))
+    hub = RunWatcherHub()
+
+    async def run():
+        events = hub.subscribe("run-1", SETTINGS)  # type: ignore[arg-type]
+        service.released.set()
+        first = await anext(events)
+        watcher = hub._watchers["run-1"]
+        await events.aclose()
+        await settle()
+        return first, watcher.task.cancelled(), len(hub)
+
+    first, cancelled, watchers = asyncio.run(run())
+
+    assert first is not None and first.data["status"] == "starting"
+    assert cancelled
+    assert watchers == 0
+
+
+def test_invalid_upstream_response_sends_the_error_event(use_service):
+    use_service(BrokenModelProviderService(["starting"]))
+    hub = RunWatcherHub()
+
+    async def run():
+        return await collect(hub, "run-1"), len(hub)
+
+    events, watchers = asyncio.run(run())
+
+    assert events == [("error", {"detail": "Unable to follow run"})]
+    assert watchers == 0
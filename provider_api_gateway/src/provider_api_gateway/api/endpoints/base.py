@@ -50,4 +50,17 @@ async def get_run_result(
     return result
 
 
+@router.post("/runs/{id}/cancel", response_model=RunStatus)
+async def cancel_run(
+    id: str,
+    client: Annotated[ReplicateClient, Depends(get_replicate_client)],
+):
+    try:
+        status = await client.cancel_run_model(id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return status
+
+
 router.include_router(providers_router, prefix="/providers", tags=["Provider Endpoints"])
@@ -0,0 +1,46 @@
+from fastapi import APIRouter, Depends
+from typing_extensions import Annotated
+
+from provider_api_gateway.providers.registry import ClientRegistry, get_client_registry
+from provider_api_gateway.schemas.caches import CacheStatsList
+from provider_api_gateway.schemas.pools import ConnectionPoolStatsList
+from provider_api_gateway.services.cache import AsyncCache
+from provider_api_gateway.services.costs import (
+    HardwareCostCache,
+    ModelCostInfo,
+    get_hardware_cost_cache,
+    get_model_cost_cache,
+)
+from provider_api_gateway.services.refs import ModelRef, get_model_ref_cache
+from provider_api_gateway.services.runs import RunStore, get_run_store
+from provider_api_gateway.services.extractors.session import (
+    ExtractorSession,
+    get_extractor_session,
+)
+
+router = APIRouter()
+
+
+@router.get("/pools", response_model=ConnectionPoolStatsList)
+async def get_pool_stats(
+    registry: Annotated[ClientRegistry, Depends(get_client_registry)],
+    extractor_session: Annotated[ExtractorSession, Depends(get_extractor_session)],
+):
+    return ConnectionPoolStatsList(pools=registry.stats() + extractor_session.stats())
+
+
+@router.get("/caches", response_model=CacheStatsList)
+async def get_cache_stats(
+    hardware_cost_cache: Annotated[HardwareCostCache, Depends(get_hardware_cost_cache)],
+    model_cost_cache: Annotated[AsyncCache[ModelCostInfo], Depends(get_model_cost_cache)],
+    model_ref_cache: Annotated[AsyncCache[ModelRef], Depends(get_model_ref_cache)],
+    run_store: Annotated[RunStore, Depends(get_run_store)],
+):
+    return CacheStatsList(
+        caches=[
+            hardware_cost_cache.stats(),
+            model_cost_cache.stats(),
+            model_ref_cache.stats(),
+            run_store.stats(),
+        ]
+    )
@@ -1,14 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel
 from typing_extensions import Annotated
 
 from provider_api_gateway.config import Settings, get_settings
+from provider_api_gateway.providers.exceptions import WebhookConfigError, WebhookSignatureError
 from provider_api_gateway.providers.replicate import (
     ReplicateClient,
     get_replicate_client,
 )
-from provider_api_gateway.schemas.models import ProviderModelCost
+from provider_api_gateway.schemas.models import (
+    ProviderModelCost,
+    ProviderModelCostWarm,
+    ProviderModelCostWarmQuery,
+)
 from provider_api_gateway.schemas.runs import Run, RunResultModel
+from provider_api_gateway.services.webhooks import verify_webhook
 
 router = APIRouter()
 
@@ -43,6 +51,33 @@ async def get_model_info(
     return data
 
 
+@router.post("/models/info/warm", response_model=ProviderModelCostWarm)
+async def warm_models_info(
+    warm_query: ProviderModelCostWarmQuery,
+    settings: Annotated[Settings, Depends(get_settings)],
+    client: Annotated[ReplicateClient, Depends(get_replicate_client)],
+):
+    try:
+        scheduled = client.warm_model_cost_info(
+            warm_query.models, settings.model_cost_warm_concurrency
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return ProviderModelCostWarm(scheduled=scheduled)
+
+
+@router.delete("/models/{model}/ref", status_code=204)
+async def invalidate_model_ref(
+    model: str,
+    client: Annotated[ReplicateClient, Depends(get_replicate_client)],
+):
+    try:
+        client.invalidate_model_ref(model)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/models/{model}/run", response_model=RunResultModel)
 async def run_model(
     model: str,
@@ -73,6 +108,27 @@ async def run_model_async(
     return run
 
 
+@router.post("/webhook", status_code=204)
+async def receive_webhook(
+    request: Request,
+    settings: Annotated[Settings, Depends(get_settings)],
+    client: Annotated[ReplicateClient, Depends(get_replicate_client)],
+):
+    if settings.replicate_webhook_secret is None:
+        raise HTTPException(status_code=403, detail="Webhooks are not enabled")
+    body = await request.body()
+    try:
+        verify_webhook(settings.replicate_webhook_secret, request.headers, body)
+    except WebhookSignatureError as e:
+        raise HTTPException(status_code=401, detail=str(e))
+    except WebhookConfigError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    try:
+        client.handle_webhook(json.loads(body))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/hardware")
 async def list_hardware(
     client: Annotated[ReplicateClient, Depends(get_replicate_client)],
@@ -1,7 +1,10 @@
 from fastapi import APIRouter
-from .endpoints import base
+from .endpoints import base, internal
 
 api_router = APIRouter()
 api_router.include_router(
     base.router, tags=["Endpoints"]
 )
+api_router.include_router(
+    internal.router, prefix="/internal", tags=["Internal Endpoints"], include_in_schema=False
+)
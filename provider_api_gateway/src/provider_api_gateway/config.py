@@ -1,5 +1,6 @@
 from functools import lru_cache
 
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,6 +13,43 @@ class Settings(BaseSettings):
 
     extractor_retry_attempts: int = 3
     extractor_retry_factor: int = 2
+    extractor_pool_limit: int = 20
+    extractor_pool_limit_per_host: int = 10
+    extractor_keepalive_timeout: float = 30.0
+    extractor_dns_cache_ttl: int = 300
+
+    replicate_pool_max_connections: int = 100
+    replicate_pool_max_keepalive_connections: int = 20
+    replicate_pool_keepalive_expiry: float = 30.0
+    replicate_http2: bool = True
+
+    hardware_cost_cache_ttl: int = 60 * 60
+    hardware_cost_cache_stale_ttl: int = 60 * 60 * 24
+    hardware_cost_snapshot_path: str | None = None
+
+    model_cost_cache_ttl: int = 60 * 60 * 6
+    model_cost_cache_stale_ttl: int = 60 * 60 * 24
+    model_cost_cache_negative_ttl: int = 60 * 10
+    model_cost_cache_max_size: int = 1024
+    model_cost_warm_concurrency: int = 4
+
+    model_ref_cache_ttl: int = 60 * 60 * 24
+    model_ref_cache_max_size: int = 1024
+
+    replicate_webhook_url: str | None = None
+    replicate_webhook_secret: str | None = None
+    run_store_ttl: int = 60 * 60 * 24
+    run_store_refresh_after: int = 60
+    run_store_max_size: int = 10000
+
+    @model_validator(mode="after")
+    def check_webhook_secret(self) -> "Settings":
+        # unsigned webhooks could forge run results, never accept them
+        if self.replicate_webhook_url is not None and self.replicate_webhook_secret is None:
+            raise ValueError(
+                "replicate_webhook_secret is required when replicate_webhook_url is set"
+            )
+        return self
 
 @lru_cache
 def get_settings() -> Settings:
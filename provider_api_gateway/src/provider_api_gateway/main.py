@@ -1,15 +1,32 @@
 import os
+from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
 
 from provider_api_gateway.api.router import api_router
+from provider_api_gateway.config import get_settings
 from provider_api_gateway.logging import configure_logging, get_logger
+from provider_api_gateway.providers.registry import registry
+from provider_api_gateway.services.costs import get_hardware_cost_cache
+from provider_api_gateway.services.extractors.session import extractor_session
 
 configure_logging()
 logger = get_logger(__name__)
 
-app = FastAPI(title="Provider API Gateway", version="0.0.1")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_settings()
+    registry.open(settings)
+    extractor_session.open(settings)
+    get_hardware_cost_cache().load_snapshot()
+    yield
+    await extractor_session.close()
+    await registry.close()
+
+
+app = FastAPI(title="Provider API Gateway", version="0.0.1", lifespan=lifespan)
 
 # Include the API routers
 app.include_router(api_router)
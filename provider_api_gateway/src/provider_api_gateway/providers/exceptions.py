@@ -1,2 +1,14 @@
 class ReplicateClientError(Exception):
     pass
+
+
+class ClientRegistryError(Exception):
+    pass
+
+
+class WebhookSignatureError(Exception):
+    pass
+
+
+class WebhookConfigError(Exception):
+    pass
@@ -0,0 +1,112 @@
+import importlib.util
+
+import httpx
+from replicate.client import _build_httpx_client
+
+from provider_api_gateway.config import Settings
+from provider_api_gateway.logging import get_logger
+from provider_api_gateway.providers.exceptions import ClientRegistryError
+from provider_api_gateway.schemas.pools import ConnectionPoolStats
+from provider_api_gateway.schemas.types import ProviderEnum
+
+logger = get_logger(__name__)
+
+
+def is_http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+class PooledHTTPClients:
+    """Keep-alive httpx clients shared by every request to a single provider."""
+
+    def __init__(
+        self,
+        provider: ProviderEnum,
+        limits: httpx.Limits,
+        http2: bool,
+        api_token: str | None = None,
+    ) -> None:
+        self.provider = provider
+        self.limits = limits
+        self.http2 = http2
+
+        self.transport = httpx.HTTPTransport(limits=limits, http2=http2)
+        self.async_transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+        self.client: httpx.Client = _build_httpx_client(
+            httpx.Client, api_token, transport=self.transport
+        )  # type: ignore[assignment]
+        self.async_client: httpx.AsyncClient = _build_httpx_client(
+            httpx.AsyncClient, api_token, transport=self.async_transport
+        )  # type: ignore[assignment]
+
+    async def aclose(self) -> None:
+        await self.async_client.aclose()
+        self.client.close()
+
+    def _stats(self, name: str, pool) -> ConnectionPoolStats:
+        connections = pool.connections
+        idle = sum(1 for connection in connections if connection.is_idle())
+        waiting = sum(1 for request in pool._requests if request.is_queued())
+        return ConnectionPoolStats(
+            name=name,
+            http2=self.http2,
+            max_connections=self.limits.max_connections,
+            max_keepalive_connections=self.limits.max_keepalive_connections,
+            idle=idle,
+            active=len(connections) - idle,
+            waiting=waiting,
+        )
+
+    def stats(self) -> list[ConnectionPoolStats]:
+        return [
+            self._stats(f"{self.provider}.async", self.async_transport._pool),
+            self._stats(f"{self.provider}.sync", self.transport._pool),
+        ]
+
+
+class ClientRegistry:
+    """App-lifespan registry of pooled provider clients."""
+
+    def __init__(self) -> None:
+        self._clients: dict[ProviderEnum, PooledHTTPClients] = {}
+
+    def open(self, settings: Settings) -> None:
+        http2 = settings.replicate_http2 and is_http2_available()
+        if settings.replicate_http2 and not http2:
+            logger.warning("HTTP/2 requested but `h2` is not installed, using HTTP/1.1")
+
+        self._clients[ProviderEnum.REPLICATE] = PooledHTTPClients(
+            ProviderEnum.REPLICATE,
+            limits=httpx.Limits(
+                max_connections=settings.replicate_pool_max_connections,
+                max_keepalive_connections=settings.replicate_pool_max_keepalive_connections,
+                keepalive_expiry=settings.replicate_pool_keepalive_expiry,
+            ),
+            http2=http2,
+            api_token=settings.replicate_api_token,
+        )
+        logger.info(
+            "Provider client pools opened", providers=[str(provider) for provider in self._clients]
+        )
+
+    async def close(self) -> None:
+        for clients in self._clients.values():
+            await clients.aclose()
+        self._clients.clear()
+        logger.info("Provider client pools closed")
+
+    def get(self, provider: ProviderEnum) -> PooledHTTPClients:
+        try:
+            return self._clients[provider]
+        except KeyError:
+            raise ClientRegistryError(f"No pooled client registered for {provider}")
+
+    def stats(self) -> list[ConnectionPoolStats]:
+        return [stats for clients in self._clients.values() for stats in clients.stats()]
+
+
+registry = ClientRegistry()
+
+
+def get_client_registry() -> ClientRegistry:
+    return registry
@@ -1,22 +1,39 @@
+import asyncio
 from enum import Enum
 from typing import Annotated, Any
 
+import httpx
 from fastapi import Depends
 from replicate import async_paginate
 from replicate.client import Client
 from replicate.exceptions import ModelError as ReplicateModelError
 from replicate.model import Model
-from replicate.version import Version
+from replicate.version import Version, Versions
 
 from provider_api_gateway.config import Settings, get_settings
 from provider_api_gateway.logging import get_logger
 from provider_api_gateway.providers.base import BaseProvider
 from provider_api_gateway.providers.exceptions import ReplicateClientError
+from provider_api_gateway.providers.registry import (
+    ClientRegistry,
+    PooledHTTPClients,
+    get_client_registry,
+)
 from provider_api_gateway.schemas.categories import ProviderModelCategory
 from provider_api_gateway.schemas.models import ProviderHardwareCost, ProviderModel, ProviderModelCost
 from provider_api_gateway.schemas.runs import Run, RunResult, RunResultModel, RunStatus
 from provider_api_gateway.schemas.types import ProviderEnum
+from provider_api_gateway.services.cache import AsyncCache
+from provider_api_gateway.services.costs import (
+    HardwareCostCache,
+    ModelCostInfo,
+    get_hardware_cost_cache,
+    get_model_cost_cache,
+)
+from provider_api_gateway.services.refs import ModelRef, get_model_ref_cache
+from provider_api_gateway.services.runs import RunStore, get_run_store, is_finished
 from provider_api_gateway.services.extractors.replicate import (
+    CostInfoModel,
     ReplicateHardwareCostExtractor,
     ReplicateModelCostExtractor,
     get_cost_table_extractor,
@@ -43,6 +60,9 @@ class ReplicatePredictionState(str, Enum):
         return tuple(state.value for state in states)
 
 
+WEBHOOK_EVENTS = ["start", "completed"]
+
+
 class ReplicateClient(BaseProvider, Client):
     PROVIDER_ID = ProviderEnum.REPLICATE
 
@@ -50,12 +70,32 @@ class ReplicateClient(BaseProvider, Client):
         self,
         model_cost_extractor: ReplicateModelCostExtractor,
         hardware_cost_extractor: ReplicateHardwareCostExtractor,
+        http_clients: PooledHTTPClients,
+        hardware_cost_cache: HardwareCostCache,
+        model_cost_cache: AsyncCache[ModelCostInfo],
+        model_ref_cache: AsyncCache[ModelRef],
+        run_store: RunStore,
+        webhook_url: str | None,
         *args,
         **kwargs,
     ) -> None:
         super().__init__(*args, **kwargs)
         self.model_cost_extractor = model_cost_extractor
         self.hardware_cost_extractor = hardware_cost_extractor
+        self.http_clients = http_clients
+        self.hardware_cost_cache = hardware_cost_cache
+        self.model_cost_cache = model_cost_cache
+        self.model_ref_cache = model_ref_cache
+        self.run_store = run_store
+        self.webhook_url = webhook_url
+
+    @property
+    def _client(self) -> httpx.Client:
+        return self.http_clients.client
+
+    @property
+    def _async_client(self) -> httpx.AsyncClient:
+        return self.http_clients.async_client
 
     async def list_categories(self) -> list[ProviderModelCategory]:
         categories = []
@@ -114,21 +154,39 @@ class ReplicateClient(BaseProvider, Client):
         self, model_slug: str, model_version: str | None, input_params: dict
     ) -> Run:
         """Run a model async from the Replicate provider."""
-        model = self.models.get(decode_string(model_slug))
-        if model_version is not None:
-            version = model.versions.get(model_version)
-        logger.info(
-            "Running model (async)", model=model, version=version, input=input_params
+        model_name = decode_string(model_slug)
+        ref = await self.model_ref_cache.get(
+            (model_name, model_version),
+            lambda: self._resolve_model_ref(model_name, model_version),
         )
-        result = await self._run_model_async(
-            ref=model if model_version is None else version, input=input_params
+        logger.info(
+            "Running model (async)", model=model_name, version=model_version, input=input_params
         )
+        result = await self._run_model_async(ref=ref, input=input_params, **self._webhook_params())
         output, execution_time = result  # type: ignore
         logger.info(
-            "Model started", model=model, execution_time=execution_time, output=output
+            "Model started", model=model_name, execution_time=execution_time, output=output
         )
+        if self.webhook_url is not None:
+            # the webhook keeps this entry up to date, lookups no longer reach the provider
+            self.run_store.put(self._to_run_result(output.dict()))
         return Run(**output.dict())
 
+    def _webhook_params(self) -> dict:
+        if self.webhook_url is None:
+            return {}
+        return {"webhook": self.webhook_url, "webhook_events_filter": WEBHOOK_EVENTS}
+
+    async def _resolve_model_ref(self, model_name: str, model_version: str | None) -> ModelRef:
+        if model_version is None:
+            return await self.models.async_get(model_name)
+        # a version can be fetched by model name directly, without loading the model first
+        return await Versions(client=self, model=model_name).async_get(model_version)
+
+    def invalidate_model_ref(self, model_slug: str) -> None:
+        """Forget the latest version resolved for a model, pinned versions never change."""
+        self.model_ref_cache.invalidate((decode_string(model_slug), None))
+
     @measured
     async def _run_model_async(self, ref: Any, input: dict, **kwargs):
         if isinstance(ref, Version):
@@ -141,20 +199,47 @@ class ReplicateClient(BaseProvider, Client):
 
     async def get_run_model_status(self, id: str) -> RunStatus:
         """Get the status of a model run by id."""
-        prediction = self.predictions.get(id)
-        logger.info("Getting status", prediction=prediction)
-        return RunStatus(**prediction.dict())
+        run = await self._get_run(id)
+        return RunStatus(**run.model_dump())
 
     async def get_run_model_result(self, id: str) -> RunResult:
         """Get the result of a model run by id."""
-        prediction = self.predictions.get(id)
-        logger.info("Getting result", prediction=prediction)
-        if prediction.status in ReplicatePredictionState.finished_states():
-            result = RunResultModel(**prediction.dict())
-            return RunResult(result=result, **prediction.dict())
+        return await self._get_run(id)
+
+    async def cancel_run_model(self, id: str) -> RunStatus:
+        """Cancel a model run by id."""
+        prediction = await self.predictions.async_cancel(id)
+        logger.info("Run cancelled", prediction=prediction)
+        run = self._to_run_result(prediction.dict())
+        self.run_store.put(run)
+        return RunStatus(**run.model_dump())
+
+    async def _get_run(self, id: str) -> RunResult:
+        run = self.run_store.get(id)
+        if run is not None:
+            return run
+        prediction = await self.predictions.async_get(id)
+        logger.info("Getting run", prediction=prediction)
+        run = self._to_run_result(prediction.dict())
+        if self.webhook_url is not None or is_finished(run):
+            self.run_store.put(run)
+        return run
+
+    def handle_webhook(self, payload: dict) -> RunResult:
+        """Store the prediction state delivered by a webhook."""
+        run = self._to_run_result(payload)
+        stored = self.run_store.put(run)
+        logger.info("Webhook received", id=run.id, status=run.status, stored=stored)
+        return run
+
+    @staticmethod
+    def _to_run_result(prediction: dict) -> RunResult:
+        if prediction.get("status") in ReplicatePredictionState.finished_states():
+            result = RunResultModel(**prediction)
+            return RunResult(result=result, **prediction)
 
         # TODO: handle other states
-        return RunResult(**prediction.dict())
+        return RunResult(**prediction)
 
     # hardware specs
 
@@ -164,15 +249,39 @@ class ReplicateClient(BaseProvider, Client):
     # cost info
 
     async def get_model_cost_info(self, model_slug: str) -> ProviderModelCost:
-        model = await self.models.async_get(decode_string(model_slug))
-        info = await self.model_cost_extractor.get_run_time_and_cost(model.url)
+        model_name = decode_string(model_slug)
+        info = await self.model_cost_cache.get(
+            model_name, lambda: self._load_model_cost_info(model_name)
+        )
 
         return ProviderModelCost(info=info)
+
+    async def _load_model_cost_info(self, model_name: str) -> CostInfoModel | None:
+        model = await self.models.async_get(model_name)
+        return await self.model_cost_extractor.get_run_time_and_cost(model.url)
+
+    def warm_model_cost_info(self, model_slugs: list[str], concurrency: int) -> int:
+        """Schedule background cost info loads for the models that are not cached yet."""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load(model_name: str) -> CostInfoModel | None:
+            async with semaphore:
+                return await self._load_model_cost_info(model_name)
+
+        scheduled = 0
+        for model_slug in model_slugs:
+            model_name = decode_string(model_slug)
+            if self.model_cost_cache.warm(model_name, lambda name=model_name: load(name)):
+                scheduled += 1
+        logger.info("Warming model cost info", requested=len(model_slugs), scheduled=scheduled)
+        return scheduled
     
     async def get_hardware_cost_info(self, url: str) -> ProviderHardwareCost:
-        info = await self.hardware_cost_extractor.extract_cost_info(url)
+        table = await self.hardware_cost_cache.get(
+            url, lambda: self.hardware_cost_extractor.extract_cost_info(url)
+        )
 
-        return ProviderHardwareCost(info=info.to_dict(orient='records') if info is not None else None)
+        return ProviderHardwareCost(info=table.to_records() if table is not None else None)
 
 
 def get_replicate_client(
@@ -183,9 +292,20 @@ def get_replicate_client(
     hardware_cost_extractor: Annotated[
         ReplicateHardwareCostExtractor, Depends(get_cost_table_extractor)
     ],
+    registry: Annotated[ClientRegistry, Depends(get_client_registry)],
+    hardware_cost_cache: Annotated[HardwareCostCache, Depends(get_hardware_cost_cache)],
+    model_cost_cache: Annotated[AsyncCache[ModelCostInfo], Depends(get_model_cost_cache)],
+    model_ref_cache: Annotated[AsyncCache[ModelRef], Depends(get_model_ref_cache)],
+    run_store: Annotated[RunStore, Depends(get_run_store)],
 ) -> ReplicateClient:
     return ReplicateClient(
         model_cost_extractor,
         hardware_cost_extractor,
+        registry.get(ReplicateClient.PROVIDER_ID),
+        hardware_cost_cache,
+        model_cost_cache,
+        model_ref_cache,
+        run_store,
+        settings.replicate_webhook_url,
         api_token=settings.replicate_api_token,
     )
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class CacheStats(BaseModel):
+    name: str
+    size: int
+    hits: int
+    stale_hits: int
+    misses: int
+    evictions: int
+    inflight: int
+
+
+class CacheStatsList(BaseModel):
+    caches: list[CacheStats]
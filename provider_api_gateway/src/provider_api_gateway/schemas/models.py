@@ -71,5 +71,13 @@ class ProviderModelCost(BaseModel):
     info: CostInfoModel | None
 
 
+class ProviderModelCostWarmQuery(BaseModel):
+    models: list[str]
+
+
+class ProviderModelCostWarm(BaseModel):
+    scheduled: int
+
+
 class ProviderHardwareCost(BaseModel):
-    info: Any | None
+    info: list[dict] | None
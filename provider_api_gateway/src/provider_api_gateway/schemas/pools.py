@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+
+
+class ConnectionPoolStats(BaseModel):
+    name: str
+    http2: bool = False
+    max_connections: int | None = None
+    max_keepalive_connections: int | None = None
+    idle: int
+    active: int
+    waiting: int
+
+
+class ConnectionPoolStatsList(BaseModel):
+    pools: list[ConnectionPoolStats]
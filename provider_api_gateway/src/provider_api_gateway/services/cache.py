@@ -0,0 +1,136 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+from provider_api_gateway.logging import get_logger
+from provider_api_gateway.schemas.caches import CacheStats
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class CacheEntry(Generic[T]):
+    __slots__ = ("value", "fetched_at")
+
+    def __init__(self, value: T, fetched_at: float) -> None:
+        self.value = value
+        self.fetched_at = fetched_at
+
+
+class AsyncCache(Generic[T]):
+    """In-process async cache with TTL, stale-while-revalidate and single-flight loads.
+
+    Fresh entries are served as is. Entries older than `ttl` but younger than
+    `ttl + stale_ttl` are served immediately while a background task reloads
+    them. Concurrent misses for the same key share one loader call.
+
+    `None` results are only cached when `negative_ttl` is set, and then expire
+    after `negative_ttl` without a stale window. When `max_size` is set the
+    least recently used entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        stale_ttl: float = 0,
+        negative_ttl: float | None = None,
+        max_size: int | None = None,
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.negative_ttl = negative_ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, CacheEntry[T]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Task[T]] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            age = time.time() - entry.fetched_at
+            if age < self._ttl(entry):
+                self.hits += 1
+                return entry.value
+            if entry.value is not None and age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._refresh(key, loader)
+                return entry.value
+
+        self.misses += 1
+        # shield the shared load so a cancelled caller does not cancel it for the others
+        return await asyncio.shield(self._refresh(key, loader))
+
+    def warm(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> bool:
+        """Start a background load unless the entry is fresh. Returns whether a load was started."""
+        entry = self._entries.get(key)
+        if entry is not None and time.time() - entry.fetched_at < self._ttl(entry):
+            return False
+        if key in self._inflight:
+            return False
+        self._refresh(key, loader)
+        return True
+
+    def set(self, key: Hashable, value: T, fetched_at: float | None = None) -> None:
+        self._entries[key] = CacheEntry(value, time.time() if fetched_at is None else fetched_at)
+        self._entries.move_to_end(key)
+        while self.max_size is not None and len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def items(self) -> list[tuple[Hashable, CacheEntry[T]]]:
+        return list(self._entries.items())
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            name=self.name,
+            size=len(self._entries),
+            hits=self.hits,
+            stale_hits=self.stale_hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            inflight=len(self._inflight),
+        )
+
+    def _ttl(self, entry: CacheEntry[T]) -> float:
+        if entry.value is None and self.negative_ttl is not None:
+            return self.negative_ttl
+        return self.ttl
+
+    def _refresh(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> asyncio.Task[T]:
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, loader))
+            task.add_done_callback(self._log_failure)
+            self._inflight[key] = task
+        return task
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[T]]) -> T:
+        try:
+            value = await loader()
+            if value is not None or self.negative_ttl is not None:
+                self.set(key, value)
+            return value
+        finally:
+            self._inflight.pop(key, None)
+
+    def _log_failure(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Failed to load cache entry", cache=self.name, error=task.exception())
@@ -0,0 +1,87 @@
+import json
+import os
+from functools import lru_cache
+from typing import Hashable
+
+from provider_api_gateway.config import get_settings
+from provider_api_gateway.logging import get_logger
+from provider_api_gateway.services.cache import AsyncCache
+from provider_api_gateway.services.extractors.replicate import CostInfoModel, HardwarePriceTable
+
+logger = get_logger(__name__)
+
+
+HardwareCostRows = HardwarePriceTable | None
+ModelCostInfo = CostInfoModel | None
+
+
+class HardwareCostCache(AsyncCache[HardwareCostRows]):
+    """Hardware price tables keyed by pricing page url, optionally snapshotted to disk."""
+
+    def __init__(
+        self, ttl: float, stale_ttl: float = 0, snapshot_path: str | None = None
+    ) -> None:
+        super().__init__("hardware_costs", ttl=ttl, stale_ttl=stale_ttl)
+        self.snapshot_path = snapshot_path
+
+    def set(self, key: Hashable, value: HardwareCostRows, fetched_at: float | None = None) -> None:
+        super().set(key, value, fetched_at)
+        if fetched_at is None:
+            self.save_snapshot()
+
+    def load_snapshot(self) -> None:
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return
+        try:
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+            for entry in snapshot["entries"]:
+                super().set(
+                    entry["key"],
+                    HardwarePriceTable.from_records(entry["value"]),
+                    fetched_at=entry["fetched_at"],
+                )
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.error("Failed to load hardware costs snapshot", path=self.snapshot_path, error=e)
+            return
+        logger.info("Loaded hardware costs snapshot", path=self.snapshot_path, entries=len(self))
+
+    def save_snapshot(self) -> None:
+        if not self.snapshot_path:
+            return
+        snapshot = {
+            "entries": [
+                {"key": key, "value": entry.value.to_records(), "fetched_at": entry.fetched_at}
+                for key, entry in self.items()
+                if entry.value is not None
+            ]
+        }
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            logger.error("Failed to save hardware costs snapshot", path=self.snapshot_path, error=e)
+
+
+@lru_cache
+def get_hardware_cost_cache() -> HardwareCostCache:
+    settings = get_settings()
+    return HardwareCostCache(
+        ttl=settings.hardware_cost_cache_ttl,
+        stale_ttl=settings.hardware_cost_cache_stale_ttl,
+        snapshot_path=settings.hardware_cost_snapshot_path,
+    )
+
+
+@lru_cache
+def get_model_cost_cache() -> AsyncCache[ModelCostInfo]:
+    settings = get_settings()
+    return AsyncCache(
+        "model_costs",
+        ttl=settings.model_cost_cache_ttl,
+        stale_ttl=settings.model_cost_cache_stale_ttl,
+        negative_ttl=settings.model_cost_cache_negative_ttl,
+        max_size=settings.model_cost_cache_max_size,
+    )
@@ -0,0 +1,168 @@
+from html.parser import HTMLParser
+
+
+class StopParsing(Exception):
+    pass
+
+
+class _TargetedParser(HTMLParser):
+    """Base for parsers that look for a single section and stop as soon as it is read."""
+
+    def parse(self, html_content: str):
+        try:
+            self.feed(html_content)
+            self.close()
+        except StopParsing:
+            pass
+        return self.result()
+
+    def stop(self):
+        raise StopParsing()
+
+    def result(self):
+        raise NotImplementedError
+
+
+class RunTimeAndCostParser(_TargetedParser):
+    """Finds the text of the "Run time and cost" section of a model page.
+
+    Returns the first paragraph after the `<h4>` heading that mentions
+    "This model runs on", falling back to the first paragraph after it.
+    """
+
+    HEADING = "Run time and cost"
+    MARKER = "This model runs on"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.section_found = False
+        self.first_paragraph: str | None = None
+        self.section_content: str | None = None
+
+        self._heading: list[str] | None = None
+        self._paragraphs: list[list[str]] = []
+
+    def handle_starttag(self, tag, attrs):
+        if not self.section_found and tag == "h4":
+            self._heading = []
+        elif self.section_found and tag == "p":
+            self._paragraphs.append([])
+
+    def handle_endtag(self, tag):
+        if tag == "h4" and self._heading is not None:
+            self.section_found = "".join(self._heading).strip() == self.HEADING
+            self._heading = None
+        elif tag == "p" and self._paragraphs:
+            self._end_paragraph(self._paragraphs.pop())
+
+    def handle_data(self, data):
+        if self._heading is not None:
+            self._heading.append(data)
+        for paragraph in self._paragraphs:
+            paragraph.append(data)
+
+    def _end_paragraph(self, pieces: list[str]):
+        text = "".join(piece.strip() for piece in pieces)
+        if self.first_paragraph is None:
+            self.first_paragraph = text
+        if self.MARKER in "".join(pieces):
+            self.section_content = text
+            self.stop()
+
+    def result(self) -> str | None:
+        if not self.section_found:
+            return None
+        if self.section_content is not None:
+            return self.section_content
+        return self.first_paragraph or None
+
+
+class PricingTableParser(_TargetedParser):
+    """Reads the first `<table>` after the "Pricing" `<h2>` heading.
+
+    Returns `(columns, rows)` where every row is a list of cell texts, or
+    `None` when the heading, table, head or body is missing.
+    """
+
+    HEADING = "Pricing"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.heading_found = False
+        self.columns: list[str] | None = None
+        self.rows: list[list[str]] | None = None
+
+        self._heading: list[str] | None = None
+        self._table_depth = 0
+        self._section: str | None = None
+        self._row: list[str] | None = None
+        self._cell: list[str] | None = None
+
+    def handle_starttag(self, tag, attrs):
+        if not self.heading_found:
+            if tag == "h2":
+                self._heading = []
+            return
+
+        if tag == "table":
+            self._table_depth += 1
+            return
+        if self._table_depth != 1:
+            return
+
+        if tag == "thead":
+            self._section = tag
+            self.columns = []
+        elif tag == "tbody":
+            self._section = tag
+            self.rows = []
+        elif tag == "tr" and self._section == "tbody":
+            self._row = []
+        elif (tag == "th" and self._section == "thead") or (tag == "td" and self._row is not None):
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        if not self.heading_found:
+            if tag == "h2" and self._heading is not None:
+                self.heading_found = "".join(self._heading).strip() == self.HEADING
+                self._heading = None
+            return
+
+        if tag == "table":
+            self._table_depth -= 1
+            if self._table_depth == 0:
+                self.stop()
+            return
+        if self._table_depth != 1:
+            return
+
+        if tag == "th" and self._cell is not None and self.columns is not None:
+            self.columns.append("".join(piece.strip() for piece in self._cell))
+            self._cell = None
+        elif tag == "td" and self._cell is not None and self._row is not None:
+            self._row.append(" ".join(piece.strip() for piece in self._cell if piece.strip()))
+            self._cell = None
+        elif tag == "tr" and self._row is not None and self.rows is not None:
+            self.rows.append(self._row)
+            self._row = None
+        elif tag in ("thead", "tbody"):
+            self._section = None
+
+    def handle_data(self, data):
+        if self._heading is not None:
+            self._heading.append(data)
+        elif self._cell is not None:
+            self._cell.append(data)
+
+    def result(self) -> tuple[list[str], list[list[str]]] | None:
+        if self.columns is None or self.rows is None:
+            return None
+        return self.columns, self.rows
+
+
+def parse_run_time_and_cost(html_content: str) -> str | None:
+    return RunTimeAndCostParser().parse(html_content)
+
+
+def parse_pricing_table(html_content: str) -> tuple[list[str], list[list[str]]] | None:
+    return PricingTableParser().parse(html_content)
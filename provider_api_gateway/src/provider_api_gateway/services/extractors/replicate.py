@@ -1,15 +1,17 @@
 import re
 from http import HTTPStatus
-from typing import Annotated
+from types import MappingProxyType
+from typing import Annotated, Iterable, Iterator, NamedTuple
 
-import aiohttp
 import aiohttp_retry
-import pandas as pd
-from bs4 import BeautifulSoup
 from fastapi import Depends
-from provider_api_gateway.config import Settings, get_settings
 from provider_api_gateway.logging import get_logger
 from provider_api_gateway.schemas.types import ProviderHardwareEnum
+from provider_api_gateway.services.extractors.parsers import (
+    parse_pricing_table,
+    parse_run_time_and_cost,
+)
+from provider_api_gateway.services.extractors.session import get_extractor_client
 from pydantic import BaseModel, Field, computed_field, field_validator
 
 logger = get_logger(__name__)
@@ -43,13 +45,6 @@ class ReplicateModelCostExtractor:
     def __init__(self, client: aiohttp_retry.RetryClient):
         self.client = client
 
-    async def __aenter__(self):
-        await self.client.__aenter__()
-        return self
-
-    async def __aexit__(self, *args, **kwargs):
-        await self.client.__aexit__(*args, **kwargs)
-
     async def fetch_page(self, url: str):
         async with self.client.get(url) as resp:
             if resp.status != HTTPStatus.OK:
@@ -58,34 +53,13 @@ class ReplicateModelCostExtractor:
             return await resp.text()
 
     def parse_content(self, url: str, html_content):
-        soup = BeautifulSoup(html_content, "html.parser")
+        run_time_and_cost = parse_run_time_and_cost(html_content)
 
-        # Find the "Run time and cost" section
-        section_header = soup.find("h4", string="Run time and cost")
-
-        if not section_header:
+        if not run_time_and_cost:
             logger.warning("Run time and cost section not found", url=url)
             return None
 
-        # Find the paragraph that contains the text "This model runs on"
-        section_content = None
-        first_paragraph = None
-        for paragraph in section_header.find_all_next("p"):
-            if not first_paragraph:
-                first_paragraph = paragraph
-            if "This model runs on" in paragraph.get_text():
-                section_content = paragraph
-                break
-
-        # Fallback to the first paragraph if the specific text is not found
-        if not section_content:
-            section_content = first_paragraph
-
-        if not section_content:
-            logger.warning("Run time and cost content not found", url=url)
-            return None
-
-        return section_content.get_text(strip=True)
+        return run_time_and_cost
 
     def extract_gpu_and_prediction_time(self, run_time_and_cost) -> CostInfoModel:
         """Extract GPU and prediction time from run_time_and_cost string using regex."""
@@ -114,6 +88,7 @@ class ReplicateModelCostExtractor:
 
     async def get_run_time_and_cost(self, url):
         html_content = await self.fetch_page(url)
+        # parsed on the loop, the parser stops at the section and takes a few milliseconds
         run_time_and_cost_info = self.parse_content(url, html_content)
         if run_time_and_cost_info:
             extracted_info = self.extract_gpu_and_prediction_time(run_time_and_cost_info)
@@ -179,92 +154,81 @@ class HardwareCostModel(BaseModel):
             return 0
 
 
-class ReplicateHardwareCostExtractor:
-    def __init__(self, client: aiohttp_retry.RetryClient):
-        self.client = client
-
-    async def __aenter__(self):
-        await self.client.__aenter__()
-        return self
+class HardwarePrice(NamedTuple):
+    name: str
+    sku: str
+    price_per_second: float | None
+    price_per_hour: float | None
+    gpu_count: int
+    cpu_count: int
+    gpu_ram_gb: int
+    ram_gb: int
 
-    async def __aexit__(self, *args, **kwargs):
-        await self.client.__aexit__(*args, **kwargs)
 
-    async def fetch_page(self, url: str):
-        async with self.client.get(url) as resp:
-            if resp.status != HTTPStatus.OK:
-                logger.error("Failed to fetch page", url=url, status=resp.status)
-                resp.raise_for_status()
-            return await resp.text()
+class HardwarePriceTable:
+    """Immutable hardware price list with O(1) lookups by SKU and by name."""
 
-    def get_cost_table(self, html_content):
-        soup = BeautifulSoup(html_content, "html.parser")
+    __slots__ = ("_rows", "_by_sku", "_by_name")
 
-        # Find the table by using the heading <h2> as an anchor
-        heading = soup.find("h2", text="Pricing")
-        if not heading:
-            return None
-        table = heading.find_next("table")
-        if not table:
-            return None
+    def __init__(self, rows: Iterable[HardwarePrice]) -> None:
+        self._rows = tuple(rows)
+        self._by_sku = MappingProxyType({row.sku: row for row in self._rows})
+        self._by_name = MappingProxyType({row.name: row for row in self._rows})
 
-        table_head = table.find("thead")
-        if not table_head:
-            return None
-        # Extract column names
-        columns = [th.get_text(strip=True) for th in table_head.find_all("th")]  # type: ignore
+    @classmethod
+    def from_records(cls, records: Iterable[dict]) -> "HardwarePriceTable":
+        return cls(HardwarePrice(**record) for record in records)
 
-        table_body = table.find("tbody")
-        if not table_body:
-            return None
-        # Extract table rows
+    def __iter__(self) -> Iterator[HardwarePrice]:
+        return iter(self._rows)
 
-        rows = []
-        for tr in table_body.find_all("tr"):  # type: ignore
-            cells = {}
-            for i, td in enumerate(tr.find_all("td")):
-                cell_content = " ".join(td.stripped_strings)
-                cells[columns[i]] = cell_content
-            rows.append(HardwareCostModel(**cells).model_dump())
+    def __len__(self) -> int:
+        return len(self._rows)
 
-        return pd.DataFrame(rows)
+    def by_sku(self, sku: str) -> HardwarePrice | None:
+        return self._by_sku.get(sku)
 
-    async def extract_cost_info(self, url: str) -> pd.DataFrame | None:
-        html_content = await self.fetch_page(url)
-        cost_table = self.get_cost_table(html_content)
+    def by_name(self, name: str) -> HardwarePrice | None:
+        return self._by_name.get(name)
 
-        return cost_table
+    def to_records(self) -> list[dict]:
+        return [row._asdict() for row in self._rows]
 
 
-def get_retry_options(
-    settings: Annotated[Settings, Depends(get_settings)],
-) -> aiohttp_retry.ExponentialRetry:
-    return aiohttp_retry.ExponentialRetry(
-        attempts=settings.extractor_retry_attempts,
-        factor=settings.extractor_retry_factor,
-    )
+class ReplicateHardwareCostExtractor:
+    def __init__(self, client: aiohttp_retry.RetryClient):
+        self.client = client
 
+    async def fetch_page(self, url: str):
+        async with self.client.get(url) as resp:
+            if resp.status != HTTPStatus.OK:
+                logger.error("Failed to fetch page", url=url, status=resp.status)
+                resp.raise_for_status()
+            return await resp.text()
 
-async def get_session() -> aiohttp.ClientSession:
-    return aiohttp.ClientSession()
+    def get_cost_table(self, html_content) -> HardwarePriceTable | None:
+        table = parse_pricing_table(html_content)
+        if table is None:
+            return None
+        columns, table_rows = table
 
+        return HardwarePriceTable(
+            HardwarePrice(**HardwareCostModel(**dict(zip(columns, cells))).model_dump())
+            for cells in table_rows
+        )
 
-async def get_retry_client(
-    session: Annotated[aiohttp.ClientSession, Depends(get_session)],
-    retry_options: Annotated[aiohttp_retry.RetryOptionsBase, Depends(get_retry_options)],
-) -> aiohttp_retry.RetryClient:
-    return aiohttp_retry.RetryClient(client_session=session, retry=retry_options)
+    async def extract_cost_info(self, url: str) -> HardwarePriceTable | None:
+        html_content = await self.fetch_page(url)
+        return self.get_cost_table(html_content)
 
 
-async def get_replicate_model_cost_extractor(
-    client: Annotated[aiohttp_retry.RetryClient, Depends(get_retry_client)],
-):
-    async with ReplicateModelCostExtractor(client) as extractor:
-        yield extractor
+def get_replicate_model_cost_extractor(
+    client: Annotated[aiohttp_retry.RetryClient, Depends(get_extractor_client)],
+) -> ReplicateModelCostExtractor:
+    return ReplicateModelCostExtractor(client)
 
 
-async def get_cost_table_extractor(
-    client: Annotated[aiohttp_retry.RetryClient, Depends(get_retry_client)],
-):
-    async with ReplicateHardwareCostExtractor(client) as extractor:
-        yield extractor
+def get_cost_table_extractor(
+    client: Annotated[aiohttp_retry.RetryClient, Depends(get_extractor_client)],
+) -> ReplicateHardwareCostExtractor:
+    return ReplicateHardwareCostExtractor(client)
@@ -0,0 +1,74 @@
+import aiohttp
+import aiohttp_retry
+
+from provider_api_gateway.config import Settings
+from provider_api_gateway.logging import get_logger
+from provider_api_gateway.schemas.pools import ConnectionPoolStats
+
+logger = get_logger(__name__)
+
+
+class ExtractorSession:
+    """App-lifespan aiohttp session shared by all page extractors."""
+
+    NAME = "extractors"
+
+    def __init__(self) -> None:
+        self._connector: aiohttp.TCPConnector | None = None
+        self._client: aiohttp_retry.RetryClient | None = None
+
+    def open(self, settings: Settings) -> None:
+        self._connector = aiohttp.TCPConnector(
+            limit=settings.extractor_pool_limit,
+            limit_per_host=settings.extractor_pool_limit_per_host,
+            keepalive_timeout=settings.extractor_keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=settings.extractor_dns_cache_ttl,
+        )
+        self._client = aiohttp_retry.RetryClient(
+            client_session=aiohttp.ClientSession(connector=self._connector),
+            retry_options=aiohttp_retry.ExponentialRetry(
+                attempts=settings.extractor_retry_attempts,
+                factor=settings.extractor_retry_factor,
+            ),
+        )
+        logger.info("Extractor session opened", limit=settings.extractor_pool_limit)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.close()
+        self._client = None
+        self._connector = None
+        logger.info("Extractor session closed")
+
+    @property
+    def client(self) -> aiohttp_retry.RetryClient:
+        if self._client is None:
+            raise RuntimeError("Extractor session is not open")
+        return self._client
+
+    def stats(self) -> list[ConnectionPoolStats]:
+        connector = self._connector
+        if connector is None:
+            return []
+        return [
+            ConnectionPoolStats(
+                name=self.NAME,
+                max_connections=connector.limit,
+                idle=sum(len(conns) for conns in connector._conns.values()),
+                active=len(connector._acquired),
+                waiting=sum(len(waiters) for waiters in connector._waiters.values()),
+            )
+        ]
+
+
+extractor_session = ExtractorSession()
+
+
+def get_extractor_session() -> ExtractorSession:
+    return extractor_session
+
+
+def get_extractor_client() -> aiohttp_retry.RetryClient:
+    return extractor_session.client
+
@@ -0,0 +1,24 @@
+from functools import lru_cache
+
+from replicate.model import Model
+from replicate.version import Version
+
+from provider_api_gateway.config import get_settings
+from provider_api_gateway.services.cache import AsyncCache
+
+ModelRef = Model | Version
+
+
+@lru_cache
+def get_model_ref_cache() -> AsyncCache[ModelRef]:
+    """Resolved model/version references keyed by `(model name, version id)`.
+
+    Versions are immutable, the `(model name, None)` entry follows the model's
+    latest version and is invalidated by the daily models sync.
+    """
+    settings = get_settings()
+    return AsyncCache(
+        "model_refs",
+        ttl=settings.model_ref_cache_ttl,
+        max_size=settings.model_ref_cache_max_size,
+    )
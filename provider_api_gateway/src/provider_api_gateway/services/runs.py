@@ -0,0 +1,91 @@
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from provider_api_gateway.config import get_settings
+from provider_api_gateway.schemas.caches import CacheStats
+from provider_api_gateway.schemas.runs import RunResult
+from provider_api_gateway.schemas.types import ProviderRunStateEnum
+from provider_api_gateway.services.cache import CacheEntry
+
+FINISHED_STATES = (ProviderRunStateEnum.COMPLETED, ProviderRunStateEnum.FAILED)
+
+
+def is_finished(run: RunResult) -> bool:
+    return run.status in FINISHED_STATES
+
+
+class RunStore:
+    """Latest known state of async runs, kept up to date by provider webhooks.
+
+    A finished run is never replaced by a late, non-final callback. Unfinished
+    runs are reported as missing once not updated for `refresh_after`, so a lost
+    webhook makes callers fall back to polling the provider instead of waiting
+    forever. Entries expire after `ttl` and the least recently updated ones are
+    evicted once `max_size` is reached.
+    """
+
+    def __init__(
+        self, name: str, ttl: float, refresh_after: float, max_size: int | None = None
+    ) -> None:
+        self.name = name
+        self.ttl = ttl
+        self.refresh_after = refresh_after
+        self.max_size = max_size
+        self._entries: OrderedDict[str, CacheEntry[RunResult]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, id: str) -> RunResult | None:
+        entry = self._entries.get(id)
+        if entry is not None:
+            age = time.time() - entry.fetched_at
+            if age >= self.ttl:
+                del self._entries[id]
+                entry = None
+            elif not is_finished(entry.value) and age >= self.refresh_after:
+                entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry.value
+
+    def put(self, run: RunResult) -> bool:
+        """Store the run state. Returns whether it replaced the stored one."""
+        entry = self._entries.get(run.id)
+        if entry is not None and is_finished(entry.value) and not is_finished(run):
+            return False
+        self._entries[run.id] = CacheEntry(run, time.time())
+        self._entries.move_to_end(run.id)
+        while self.max_size is not None and len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            name=self.name,
+            size=len(self._entries),
+            hits=self.hits,
+            stale_hits=0,
+            misses=self.misses,
+            evictions=self.evictions,
+            inflight=0,
+        )
+
+
+@lru_cache
+def get_run_store() -> RunStore:
+    settings = get_settings()
+    return RunStore(
+        "runs",
+        ttl=settings.run_store_ttl,
+        refresh_after=settings.run_store_refresh_after,
+        max_size=settings.run_store_max_size,
+    )
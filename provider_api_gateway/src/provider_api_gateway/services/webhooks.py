@@ -0,0 +1,98 @@
+"""Provider webhook signatures, following the Standard Webhooks scheme used by Replicate.
+
+Running this module posts a signed prediction payload to a gateway, standing
+in for the provider when developing or testing webhook handling locally::
+
+    python -m provider_api_gateway.services.webhooks \\
+        http://localhost:8000/providers/replicate/webhook prediction.json
+"""
+import argparse
+import asyncio
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import time
+import uuid
+from typing import Mapping
+
+import httpx
+
+from provider_api_gateway.providers.exceptions import WebhookConfigError, WebhookSignatureError
+
+SIGNATURE_VERSION = "v1"
+
+
+def _secret_bytes(secret: str) -> bytes:
+    try:
+        return base64.b64decode(
+            secret.split("_", 1)[1] if secret.startswith("whsec_") else secret, validate=True
+        )
+    except binascii.Error:
+        raise WebhookConfigError("Webhook secret is not valid base64")
+
+
+def sign_webhook(secret: str, webhook_id: str, timestamp: str, body: bytes) -> str:
+    signed_content = f"{webhook_id}.{timestamp}.".encode() + body
+    digest = hmac.new(_secret_bytes(secret), signed_content, hashlib.sha256).digest()
+    return f"{SIGNATURE_VERSION},{base64.b64encode(digest).decode()}"
+
+
+def verify_webhook(
+    secret: str, headers: Mapping[str, str], body: bytes, tolerance: float = 5 * 60
+) -> None:
+    try:
+        webhook_id = headers["webhook-id"]
+        timestamp = headers["webhook-timestamp"]
+        signatures = headers["webhook-signature"].split()
+    except KeyError as e:
+        raise WebhookSignatureError(f"Missing webhook header {e}")
+
+    try:
+        sent_at = int(timestamp)
+    except ValueError:
+        raise WebhookSignatureError("Invalid webhook timestamp")
+    if abs(time.time() - sent_at) > tolerance:
+        raise WebhookSignatureError("Webhook timestamp is outside of the tolerance window")
+
+    expected = sign_webhook(secret, webhook_id, timestamp, body)
+    if not any(hmac.compare_digest(expected, signature) for signature in signatures):
+        raise WebhookSignatureError("Webhook signature does not match")
+
+
+async def send_webhook(
+    client: httpx.AsyncClient, url: str, payload: dict, secret: str | None = None
+) -> httpx.Response:
+    """Post `payload` to `url` the way the provider delivers a webhook."""
+    body = json.dumps(payload).encode()
+    headers = {"content-type": "application/json"}
+    if secret is not None:
+        webhook_id = f"msg_{uuid.uuid4().hex}"
+        timestamp = str(int(time.time()))
+        headers.update(
+            {
+                "webhook-id": webhook_id,
+                "webhook-timestamp": timestamp,
+                "webhook-signature": sign_webhook(secret, webhook_id, timestamp, body),
+            }
+        )
+    return await client.post(url, content=body, headers=headers)
+
+
+async def _main(url: str, payload_path: str, secret: str | None) -> None:
+    with open(payload_path) as f:
+        payload = json.load(f)
+    async with httpx.AsyncClient() as client:
+        response = await send_webhook(client, url, payload, secret)
+    print(response.status_code, response.text)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Send a signed prediction webhook")
+    parser.add_argument("url")
+    parser.add_argument("payload", help="path to a prediction JSON payload")
+    parser.add_argument("--secret", default=os.environ.get("REPLICATE_WEBHOOK_SECRET"))
+    args = parser.parse_args()
+    asyncio.run(_main(args.url, args.payload, args.secret))
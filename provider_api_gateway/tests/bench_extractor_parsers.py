@@ -0,0 +1,61 @@
+"""Times the stdlib page parsers against the BeautifulSoup code they replaced.
+
+The fixture pages are padded with unrelated markup after the section they
+read, where a real model page puts its examples and README. Needs `bs4`::
+
+    PYTHONPATH=src python tests/bench_extractor_parsers.py [--padding 5000]
+"""
+import argparse
+import time
+import tracemalloc
+
+from test_extractor_parsers import (
+    bs4_pricing_table,
+    bs4_run_time_and_cost,
+    read_page,
+)
+
+from provider_api_gateway.services.extractors.parsers import (
+    parse_pricing_table,
+    parse_run_time_and_cost,
+)
+
+FILLER = '<div class="card"><h3>Example</h3><p>Some <a href="#">example</a> output.</p></div>'
+
+
+def measure(parse, html_content: str, runs: int) -> tuple[float, float]:
+    started = time.perf_counter()
+    for _ in range(runs):
+        parse(html_content)
+    elapsed = (time.perf_counter() - started) / runs
+
+    tracemalloc.start()
+    parse(html_content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(padding: int, runs: int) -> None:
+    cases = [
+        ("model page", "model_page.html", bs4_run_time_and_cost, parse_run_time_and_cost),
+        ("pricing page", "pricing_page.html", bs4_pricing_table, parse_pricing_table),
+    ]
+    for label, name, before, after in cases:
+        html_content = read_page(name).replace("</body>", FILLER * padding + "</body>", 1)
+        result = after(html_content)
+        assert (list(result) if isinstance(result, tuple) else result) == before(html_content)
+        for implementation, parse in (("bs4", before), ("parsers", after)):
+            elapsed, peak = measure(parse, html_content, runs)
+            print(
+                f"{label:12} {len(html_content) / 1024:6.0f} KiB  {implementation:8}"
+                f" {elapsed * 1000:8.1f} ms  peak {peak / 2**20:6.2f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--padding", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    main(args.padding, args.runs)
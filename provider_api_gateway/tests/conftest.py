@@ -0,0 +1,4 @@
+import os
+
+# settings are read on first use, the tests never reach the real provider
+os.environ.setdefault("REPLICATE_API_TOKEN", "test-token")
@@ -0,0 +1,92 @@
+"""The stdlib page parsers must read the same text as the BeautifulSoup code they replaced.
+
+`fixtures/pages/expected.json` holds what the BeautifulSoup extractors
+returned for every fixture page. When `bs4` is installed the reference
+implementation below is also run again, to keep that file honest.
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from provider_api_gateway.services.extractors.parsers import (
+    parse_pricing_table,
+    parse_run_time_and_cost,
+)
+
+PAGES = Path(__file__).parent / "fixtures" / "pages"
+EXPECTED = json.loads((PAGES / "expected.json").read_text())
+
+MODEL_PAGES = sorted(name for name in EXPECTED if name.startswith("model_page"))
+PRICING_PAGES = sorted(name for name in EXPECTED if name.startswith("pricing_page"))
+
+
+def read_page(name: str) -> str:
+    return (PAGES / name).read_text()
+
+
+def bs4_run_time_and_cost(html_content: str) -> str | None:
+    """`ReplicateModelCostExtractor.parse_content` before the parsers were introduced."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+    section_header = soup.find("h4", string="Run time and cost")
+    if not section_header:
+        return None
+
+    section_content = None
+    first_paragraph = None
+    for paragraph in section_header.find_all_next("p"):
+        if not first_paragraph:
+            first_paragraph = paragraph
+        if "This model runs on" in paragraph.get_text():
+            section_content = paragraph
+            break
+    if not section_content:
+        section_content = first_paragraph
+    if not section_content:
+        return None
+    return section_content.get_text(strip=True)
+
+
+def bs4_pricing_table(html_content: str) -> list | None:
+    """`ReplicateHardwareCostExtractor.get_cost_table` before the parsers, without the DataFrame."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html_content, "html.parser")
+    heading = soup.find("h2", string="Pricing")
+    if not heading:
+        return None
+    table = heading.find_next("table")
+    if not table:
+        return None
+    table_head = table.find("thead")
+    if not table_head:
+        return None
+    columns = [th.get_text(strip=True) for th in table_head.find_all("th")]
+    table_body = table.find("tbody")
+    if not table_body:
+        return None
+    rows = [
+        [" ".join(td.stripped_strings) for td in tr.find_all("td")]
+        for tr in table_body.find_all("tr")
+    ]
+    return [columns, rows]
+
+
+@pytest.mark.parametrize("name", MODEL_PAGES)
+def test_run_time_and_cost_matches_bs4(name):
+    assert parse_run_time_and_cost(read_page(name)) == EXPECTED[name]
+
+
+@pytest.mark.parametrize("name", PRICING_PAGES)
+def test_pricing_table_matches_bs4(name):
+    table = parse_pricing_table(read_page(name))
+    assert (list(table) if table is not None else None) == EXPECTED[name]
+
+
+@pytest.mark.parametrize("name", MODEL_PAGES + PRICING_PAGES)
+def test_expected_output_is_bs4_output(name):
+    pytest.importorskip("bs4")
+    parse = bs4_run_time_and_cost if name.startswith("model_page") else bs4_pricing_table
+    assert parse(read_page(name)) == EXPECTED[name]
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import time
+
+import httpcore
+import httpx
+
+from provider_api_gateway.providers.registry import PooledHTTPClients
+from provider_api_gateway.providers.replicate import ReplicateClient
+from provider_api_gateway.schemas.types import ProviderEnum, ProviderRunStateEnum
+from provider_api_gateway.services.cache import AsyncCache
+from provider_api_gateway.services.runs import RunStore
+
+LATENCY = 0.2
+POLLS = 20
+
+
+class FakeReplicateStream(httpcore.AsyncNetworkStream):
+    """One fake connection to the Replicate API, answering prediction GETs after a delay."""
+
+    def __init__(self, backend: "CountingBackend") -> None:
+        self.backend = backend
+        self.responses: list[bytes] = []
+        self.closed = False
+
+    async def write(self, buffer: bytes, timeout: float | None = None) -> None:
+        request_line = buffer.split(b"\r\n", 1)[0].decode()
+        if not request_line.endswith(" HTTP/1.1"):
+            return  # request body, GETs have none
+        path = request_line.split()[1]
+        body = json.dumps(
+            {
+                "id": path.rsplit("/", 1)[-1],
+                "model": "owner/model",
+                "version": "v1",
+                "status": "processing",
+                "input": {},
+                "urls": {},
+            }
+        ).encode()
+        self.responses.append(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+        self.backend.request_started()
+
+    async def read(self, max_bytes: int, timeout: float | None = None) -> bytes:
+        if self.closed or not self.responses:
+            return b""
+        await asyncio.sleep(self.backend.latency)
+        self.backend.request_finished()
+        return self.responses.pop(0)
+
+    async def aclose(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.backend.connections -= 1
+
+    async def start_tls(self, ssl_context, server_hostname=None, timeout=None):
+        return self
+
+    def get_extra_info(self, info: str):
+        return None
+
+
+class CountingBackend(httpcore.AsyncNetworkBackend):
+    """Network backend for the real httpx pool that counts the connections it opens."""
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.opened = 0
+        self.connections = 0
+        self.max_connections = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.opened += 1
+        self.connections += 1
+        self.max_connections = max(self.max_connections, self.connections)
+        return FakeReplicateStream(self)
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        raise NotImplementedError
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+    def request_started(self) -> None:
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def request_finished(self) -> None:
+        self.in_flight -= 1
+
+
+def make_client(max_connections: int, backend: CountingBackend) -> ReplicateClient:
+    http_clients = PooledHTTPClients(
+        ProviderEnum.REPLICATE,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=None),
+        http2=False,
+        api_token="token",
+    )
+    # keep the real pool and its limits, only replace the sockets underneath
+    http_clients.async_transport._pool._network_backend = backend
+    return ReplicateClient(
+        model_cost_extractor=None,  # type: ignore[arg-type]
+        hardware_cost_extractor=None,  # type: ignore[arg-type]
+        http_clients=http_clients,
+        hardware_cost_cache=None,  # type: ignore[arg-type]
+        model_cost_cache=AsyncCache("model_costs", ttl=60),
+        model_ref_cache=AsyncCache("model_refs", ttl=60),
+        run_store=RunStore("runs", ttl=60, refresh_after=60),
+        webhook_url=None,
+        api_token="token",
+    )
+
+
+async def poll(client: ReplicateClient, count: int):
+    return await asyncio.gather(
+        *(client.get_run_model_status(f"prediction-{i}") for i in range(count))
+    )
+
+
+def test_parallel_status_polls_share_the_pooled_client():
+    async def run():
+        backend = CountingBackend(latency=LATENCY)
+        client = make_client(POLLS, backend)
+
+        started = time.perf_counter()
+        statuses = await poll(client, POLLS)
+        elapsed = time.perf_counter() - started
+
+        assert [status.id for status in statuses] == [f"prediction-{i}" for i in range(POLLS)]
+        assert all(status.status == ProviderRunStateEnum.RUNNING for status in statuses)
+        # every poll went through the pool at the same time
+        assert backend.requests == POLLS
+        assert backend.max_in_flight == POLLS
+        assert elapsed < LATENCY * 3
+
+        # a second round reuses the keep-alive connections of the first
+        await poll(client, POLLS)
+        assert backend.opened == POLLS
+        await client.http_clients.aclose()
+
+    asyncio.run(run())
+
+
+def test_parallel_status_polls_are_bounded_by_the_pool():
+    async def run():
+        limit = 5
+        backend = CountingBackend(latency=LATENCY)
+        client = make_client(limit, backend)
+
+        statuses = await poll(client, POLLS)
+
+        assert len(statuses) == POLLS
+        assert backend.requests == POLLS
+        assert backend.max_connections == limit
+        assert backend.max_in_flight == limit
+        await client.http_clients.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from provider_api_gateway.config import Settings, get_settings
+from provider_api_gateway.main import app
+from provider_api_gateway.providers.replicate import ReplicateClient, get_replicate_client
+from provider_api_gateway.schemas.runs import RunResult
+from provider_api_gateway.schemas.types import ProviderRunStateEnum
+from provider_api_gateway.services.cache import AsyncCache
+from provider_api_gateway.services.runs import RunStore
+from provider_api_gateway.services.webhooks import send_webhook, sign_webhook
+
+SECRET = "whsec_c2VjcmV0LWZvci10ZXN0cw=="
+WEBHOOK_URL = "http://gateway/providers/replicate/webhook"
+
+
+def prediction(status: str, output=None) -> dict:
+    return {
+        "id": "prediction-1",
+        "status": status,
+        "output": output,
+        "error": None,
+        "metrics": {"predict_time": 1.5} if status == "succeeded" else {},
+        "created_at": "2024-05-01T10:00:00Z",
+        "completed_at": "2024-05-01T10:00:02Z" if status == "succeeded" else None,
+    }
+
+
+@pytest.fixture
+def run_store() -> RunStore:
+    return RunStore("runs", ttl=60, refresh_after=60)
+
+
+@pytest.fixture
+def gateway(run_store: RunStore):
+    settings = Settings(replicate_webhook_url=WEBHOOK_URL, replicate_webhook_secret=SECRET)
+    client = ReplicateClient(
+        model_cost_extractor=None,  # type: ignore[arg-type]
+        hardware_cost_extractor=None,  # type: ignore[arg-type]
+        http_clients=None,  # type: ignore[arg-type]
+        hardware_cost_cache=None,  # type: ignore[arg-type]
+        model_cost_cache=AsyncCache("model_costs", ttl=60),
+        model_ref_cache=AsyncCache("model_refs", ttl=60),
+        run_store=run_store,
+        webhook_url=WEBHOOK_URL,
+        api_token="test-token",
+    )
+    app.dependency_overrides[get_settings] = lambda: settings
+    app.dependency_overrides[get_replicate_client] = lambda: client
+    yield httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gateway")
+    app.dependency_overrides.clear()
+
+
+def deliver(gateway: httpx.AsyncClient, payload: dict, secret: str | None) -> httpx.Response:
+    async def run():
+        async with gateway:
+            return await send_webhook(gateway, WEBHOOK_URL, payload, secret)
+
+    return asyncio.run(run())
+
+
+def test_signed_webhook_is_stored(gateway, run_store):
+    response = deliver(gateway, prediction("succeeded", output="done"), SECRET)
+
+    assert response.status_code == 204
+    run = run_store.get("prediction-1")
+    assert run is not None
+    assert run.status == ProviderRunStateEnum.COMPLETED
+    assert run.result is not None and run.result.output == "done"
+
+
+def test_unsigned_webhook_is_rejected(gateway, run_store):
+    response = deliver(gateway, prediction("succeeded", output="forged"), secret=None)
+
+    assert response.status_code == 401
+    assert run_store.get("prediction-1") is None
+
+
+def test_webhook_with_bad_signature_is_rejected(gateway, run_store):
+    response = deliver(gateway, prediction("succeeded", output="forged"), "whsec_b3RoZXI=")
+
+    assert response.status_code == 401
+    assert run_store.get("prediction-1") is None
+
+
+def test_stale_webhook_is_rejected(gateway, run_store):
+    body = json.dumps(prediction("succeeded", output="replayed")).encode()
+    timestamp = str(int(time.time()) - 60 * 60)
+    headers = {
+        "content-type": "application/json",
+        "webhook-id": "msg_1",
+        "webhook-timestamp": timestamp,
+        "webhook-signature": sign_webhook(SECRET, "msg_1", timestamp, body),
+    }
+
+    async def run():
+        async with gateway:
+            return await gateway.post(WEBHOOK_URL, content=body, headers=headers)
+
+    response = asyncio.run(run())
+
+    assert response.status_code == 401
+    assert run_store.get("prediction-1") is None
+
+
+def test_late_processing_webhook_does_not_replace_finished_run(gateway, run_store):
+    async def run():
+        async with gateway:
+            finished = await send_webhook(
+                gateway, WEBHOOK_URL, prediction("succeeded", output="done"), SECRET
+            )
+            late = await send_webhook(gateway, WEBHOOK_URL, prediction("processing"), SECRET)
+            return finished, late
+
+    finished, late = asyncio.run(run())
+
+    assert finished.status_code == 204
+    assert late.status_code == 204
+    run = run_store.get("prediction-1")
+    assert run is not None
+    assert run.status == ProviderRunStateEnum.COMPLETED
+    assert run.result is not None and run.result.output == "done"
+
+
+def test_run_store_keeps_finished_runs():
+    store = RunStore("runs", ttl=60, refresh_after=60)
+    finished = RunResult(**prediction("succeeded"))
+    running = RunResult(**prediction("processing"))
+
+    assert store.put(finished)
+    assert not store.put(running)
+    assert store.get("prediction-1").status == ProviderRunStateEnum.COMPLETED
+
+
+def test_run_store_reports_stale_unfinished_runs_as_missing():
+    store = RunStore("runs", ttl=60, refresh_after=0)
+
+    store.put(RunResult(**prediction("processing")))
+
+    assert store.get("prediction-1") is None